@@ -7,15 +7,31 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from .config import BASE_URL, BRAND_LOGO_FILE, GCS_IMG_BASE, STATIC_DIR, category_label_ja
+from .config import (
+    BASE_URL,
+    BRAND_LOGO_FILE,
+    CONTENT_WATCH,
+    GCS_IMG_BASE,
+    JOBS_WATCH,
+    STATIC_DIR,
+    category_label_ja,
+)
 from .dependencies import db  # noqa: F401 — init Firebase on import
 from .md_parser import parse_starful_md
 from .reactions import router as reactions_router
 from .routes.api_starr import router as starr_router
+from .routes.api_suggest import router as suggest_router
 from .routes.pages import router as pages_router
 from .routes.seo import register_seo
-from .services.jobs_cache import JOB_DATA, load_jobs_on_startup
+from .services.content_watch import start_content_watcher, stop_content_watcher
+from .services.jobs_cache import (
+    JOB_DATA,
+    load_jobs_on_startup,
+    start_jobs_watcher,
+    stop_jobs_watcher,
+)
 from .services.media import career_img_url, gcs_or_static_img, serve_img
+from .services.page_executor import page_executor
 from .templating import templates
 
 load_dotenv()
@@ -24,7 +40,14 @@ load_dotenv()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     load_jobs_on_startup()
+    if JOBS_WATCH:
+        start_jobs_watcher()
+    if CONTENT_WATCH:
+        start_content_watcher()
     yield
+    stop_content_watcher()
+    stop_jobs_watcher()
+    page_executor.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -42,6 +65,7 @@ register_seo(app)
 
 app.include_router(pages_router)
 app.include_router(starr_router, prefix="/api")
+app.include_router(suggest_router, prefix="/api")
 app.include_router(reactions_router, prefix="/api")
 
 __all__ = [
@@ -0,0 +1,275 @@
+"""Career guide Markdown → HTML rendering (no app imports; safe for build scripts)."""
+from __future__ import annotations
+
+import html as html_lib
+import re
+from typing import Any
+
+import markdown
+
+# Bump when rendering output changes so stale prerendered bundles are ignored.
+RENDER_VERSION = "3"
+
+_TAG = re.compile(r"<[^>]+>")
+_ID_ATTR = re.compile(r'\sid="([^"]*)"')
+_LOADING_ATTR = re.compile(r"\sloading=", re.IGNORECASE)
+_STATIC_IMG_URL = re.compile(r'(/static/img/[^"\'?\s>]+)')
+_LATIN_WORD = re.compile(r"[A-Za-z0-9_]+")
+_NON_ASCII_RUN = re.compile(r"[^\x00-\x7f\s]+")
+_SLUG_DROP = re.compile(r"[^\w\s-]")
+_SLUG_SEP = re.compile(r"[\s_-]+")
+
+
+def career_cache_version(meta: dict[str, Any]) -> str:
+    """`?v=` value for in-body static images (published_at date, or '')."""
+    v = str(meta.get("published_at") or "")[:10]
+    return v if len(v) >= 8 else ""
+
+
+def render_markdown(body: str) -> str:
+    return markdown.markdown(body, extensions=["tables"])
+
+
+class HtmlStage:
+    """One step of HtmlPipeline. Tag hooks return the (possibly rewritten) tag.
+
+    Only overridden hooks are called, and only for tag names in `tags`.
+    """
+
+    tags: frozenset[str] = frozenset()
+
+    def start_tag(self, name: str, tag: str, run: "PipelineRun") -> str:
+        return tag
+
+    def end_tag(self, name: str, tag: str, run: "PipelineRun") -> str:
+        return tag
+
+    def text(self, text: str, run: "PipelineRun") -> None:
+        """Observe the markup between matched tags (other tags and entities left as-is)."""
+
+    def finish(self, run: "PipelineRun") -> None:
+        """Write collected data to run.results."""
+
+
+class PipelineRun:
+    """Per-document state shared by stages: output chunks and results."""
+
+    __slots__ = ("out", "results")
+
+    def __init__(self) -> None:
+        self.out: list[str] = []
+        self.results: dict[str, Any] = {}
+
+
+class HtmlPipeline:
+    """Single pass over rendered HTML for a set of stages.
+
+    Only tags some stage asked for are tokenized (one regex scan); the markup in
+    between goes to text hooks in chunks, so the Python loop runs per interesting
+    tag rather than per tag. Assumes Markdown output (no '>' inside attributes).
+    """
+
+    def __init__(self, stages: list[HtmlStage]):
+        self.stages = stages
+        self._start = self._hooks("start_tag")
+        self._end = self._hooks("end_tag")
+        self._text = [s.text for s in stages if type(s).text is not HtmlStage.text]
+        names = sorted(set().union(*(s.tags for s in stages)))
+        self._token = re.compile(
+            rf"<(/?)({'|'.join(names) or '(?!)'})\b[^>]*>", re.IGNORECASE
+        )
+
+    def _hooks(self, hook: str) -> list[tuple[frozenset[str], Any]]:
+        base = getattr(HtmlStage, hook)
+        return [(s.tags, getattr(s, hook)) for s in self.stages if getattr(type(s), hook) is not base]
+
+    def run(self, html: str) -> tuple[str, dict[str, Any]]:
+        run = PipelineRun()
+        out = run.out
+        text_hooks = self._text
+        pos = 0
+        for m in self._token.finditer(html):
+            start = m.start()
+            if start > pos:
+                raw = html[pos:start]
+                out.append(raw)
+                for hook in text_hooks:
+                    hook(raw, run)
+            tag = m.group(0)
+            name = m.group(2).lower()
+            for tags, hook in self._end if m.group(1) else self._start:
+                if name in tags:
+                    tag = hook(name, tag, run)
+            out.append(tag)
+            pos = m.end()
+        if pos < len(html):
+            raw = html[pos:]
+            out.append(raw)
+            for hook in text_hooks:
+                hook(raw, run)
+        for stage in self.stages:
+            stage.finish(run)
+        return "".join(out), run.results
+
+
+class CacheBustImages(HtmlStage):
+    """Append `?v=<cache_v>` to /static/img/ URLs in image and link tags."""
+
+    tags = frozenset({"img", "a", "source"})
+
+    def __init__(self, cache_v: str):
+        self.cache_v = cache_v
+
+    def _bust(self, m: re.Match) -> str:
+        url = m.group(1)
+        return url if "?v=" in url else f"{url}?v={self.cache_v}"
+
+    def start_tag(self, name: str, tag: str, run: PipelineRun) -> str:
+        if self.cache_v and "/static/img/" in tag:
+            return _STATIC_IMG_URL.sub(self._bust, tag)
+        return tag
+
+
+class LazyImages(HtmlStage):
+    """loading="lazy" decoding="async" on body images (the hero is outside the body)."""
+
+    tags = frozenset({"img"})
+
+    def start_tag(self, name: str, tag: str, run: PipelineRun) -> str:
+        if _LOADING_ATTR.search(tag):
+            return tag
+        close = " />" if tag.endswith("/>") else ">"
+        head = tag[: -len(close.strip())].rstrip()
+        return f'{head} loading="lazy" decoding="async"{close}'
+
+
+def html_text(html: str) -> str:
+    return html_lib.unescape(_TAG.sub("", html))
+
+
+def count_words(text: str) -> int:
+    """Latin words + non-ASCII characters (≈ 文字数 for Japanese guides)."""
+    # Sum run lengths rather than findall() per character: one list item per run.
+    return len(_LATIN_WORD.findall(text)) + sum(map(len, _NON_ASCII_RUN.findall(text)))
+
+
+def heading_slug(text: str) -> str:
+    slug = _SLUG_SEP.sub("-", _SLUG_DROP.sub("", text.lower())).strip("-")
+    return slug or "section"
+
+
+class HeadingAnchors(HtmlStage):
+    """id attributes on H2/H3 plus results["toc"] = [{"level", "text", "id"}]."""
+
+    tags = frozenset({"h2", "h3"})
+
+    def __init__(self) -> None:
+        self._open: tuple[str, int, str | None] | None = None
+        self._texts: list[str] = []
+        self._used: dict[str, int] = {}
+        self.toc: list[dict[str, Any]] = []
+
+    def start_tag(self, name: str, tag: str, run: PipelineRun) -> str:
+        if self._open is None:
+            existing = _ID_ATTR.search(tag)
+            # Output index this tag will occupy; patched with the id at </hN>.
+            self._open = (name, len(run.out), existing.group(1) if existing else None)
+            self._texts = []
+        return tag
+
+    def text(self, text: str, run: PipelineRun) -> None:
+        if self._open is not None:
+            self._texts.append(text)
+
+    def end_tag(self, name: str, tag: str, run: PipelineRun) -> str:
+        if self._open is None or name != self._open[0]:
+            return tag
+        level, index, anchor = self._open
+        self._open = None
+        text = " ".join(html_text("".join(self._texts)).split())
+        if not text:
+            return tag
+        if anchor is None:
+            anchor = self._unique(heading_slug(text))
+            start = run.out[index]
+            run.out[index] = f'{start[:len(level) + 1]} id="{html_lib.escape(anchor)}"{start[len(level) + 1:]}'
+        self.toc.append({"level": int(level[1]), "text": text, "id": anchor})
+        return tag
+
+    def _unique(self, slug: str) -> str:
+        n = self._used.get(slug, 0) + 1
+        self._used[slug] = n
+        return slug if n == 1 else f"{slug}-{n}"
+
+    def finish(self, run: PipelineRun) -> None:
+        run.results["toc"] = self.toc
+
+
+class SectionSplit(HtmlStage):
+    """results["section_offsets"]: character offset of each H2 in the output HTML."""
+
+    tags = frozenset({"h2"})
+
+    def __init__(self) -> None:
+        self._chunks: list[int] = []
+
+    def start_tag(self, name: str, tag: str, run: PipelineRun) -> str:
+        self._chunks.append(len(run.out))
+        return tag
+
+    def finish(self, run: PipelineRun) -> None:
+        # Offsets are taken at the end: other stages may still rewrite chunks until then.
+        offsets: list[int] = []
+        pos = 0
+        starts = iter(self._chunks)
+        nxt = next(starts, None)
+        for i, chunk in enumerate(run.out):
+            if i == nxt:
+                offsets.append(pos)
+                nxt = next(starts, None)
+            pos += len(chunk)
+        run.results["section_offsets"] = offsets
+
+
+def split_sections(content: str, offsets: list[int]) -> list[str]:
+    """Split rendered HTML at H2 boundaries; anything before the first H2 joins section 0."""
+    bounds = [0, *offsets[1:], len(content)]
+    return [content[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+class WordCount(HtmlStage):
+    """results["word_count"] over the document text (see count_words)."""
+
+    def __init__(self) -> None:
+        self._texts: list[str] = []
+
+    def text(self, text: str, run: PipelineRun) -> None:
+        self._texts.append(text)
+
+    def finish(self, run: PipelineRun) -> None:
+        run.results["word_count"] = count_words(html_text("".join(self._texts)))
+
+
+def career_pipeline(cache_v: str) -> HtmlPipeline:
+    """Stages keep per-document state: build one pipeline per render."""
+    return HtmlPipeline(
+        [CacheBustImages(cache_v), LazyImages(), HeadingAnchors(), SectionSplit(), WordCount()]
+    )
+
+
+def render_career_artifact(meta: dict[str, Any], body: str) -> dict[str, Any]:
+    """Rendered body plus derived data stored in the prerendered bundle."""
+    cache_v = career_cache_version(meta)
+    content, results = career_pipeline(cache_v).run(render_markdown(body))
+    return {
+        "content": content,
+        "toc": results["toc"],
+        "word_count": results["word_count"],
+        "section_offsets": results["section_offsets"],
+        "cache_v": cache_v,
+    }
+
+
+def render_career_body(meta: dict[str, Any], body: str) -> str:
+    """Rendered article HTML for detail.html (`content`)."""
+    return render_career_artifact(meta, body)["content"]
@@ -12,10 +12,42 @@ STATIC_DIR = os.path.join(BASE_DIR, "static")
 TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
 CONTENTS_DIR = os.path.join(BASE_DIR, "contents")
 DATA_FILE = os.path.join(STATIC_DIR, "json", "job_data.json")
+# Prerendered career bodies written by scripts/build_data.py (not served statically)
+PRERENDER_FILE = os.path.join(BASE_DIR, "prerender", "career_pages.json")
+# BM25 index of guide bodies for /search, written by scripts/build_data.py
+BODY_INDEX_FILE = os.path.join(BASE_DIR, "prerender", "body_index.bin")
 
 BASE_URL = os.getenv("SITE_URL", "https://starful.biz").rstrip("/")
+# Deployed code revision (Cloud Run sets K_REVISION); part of HTML ETags
+APP_REVISION = os.getenv("K_REVISION") or os.getenv("STARFUL_APP_REVISION", "")
 BRAND_LOGO_FILE = "brand_biz_mark.png"
 
+# Rendered /career/{id} pages kept in memory (LRU, keyed by Markdown mtime/size)
+CAREER_RENDER_CACHE_SIZE = int(os.getenv("STARFUL_CAREER_RENDER_CACHE_SIZE", "256"))
+# H2 sections of a career guide sent inline; later ones load from
+# /career/{id}/section/{n} on scroll. 0 = whole guide inline.
+CAREER_INLINE_SECTIONS = int(os.getenv("STARFUL_CAREER_INLINE_SECTIONS", "0"))
+# Full HTML responses (+ gzip/br variants) kept per ETag
+PAGE_CACHE_SIZE = int(os.getenv("STARFUL_PAGE_CACHE_SIZE", "256"))
+# /search result lists kept per (normalized query, snapshot version); 0 = off
+SEARCH_CACHE_SIZE = int(os.getenv("STARFUL_SEARCH_CACHE_SIZE", "512"))
+# Seconds browsers and CDNs may reuse an /api/suggest response
+SUGGEST_MAX_AGE = int(os.getenv("STARFUL_SUGGEST_MAX_AGE", "300"))
+# Stream detail.html with Jinja's generate() on a page-store miss (0 = render, then send)
+STREAM_PAGES = os.getenv("STARFUL_STREAM_PAGES", "1") != "0"
+# Dedicated render pool (app.services.page_executor); queue limit 0 = unbounded
+PAGE_WORKERS = int(os.getenv("STARFUL_PAGE_WORKERS", "4"))
+PAGE_QUEUE_LIMIT = int(os.getenv("STARFUL_PAGE_QUEUE_LIMIT", "256"))
+# Seconds between job_data.json mtime checks on the request path (0 = every request)
+JOBS_CHECK_INTERVAL = float(os.getenv("STARFUL_JOBS_CHECK_INTERVAL", "2"))
+# Poll job_data.json from a background thread instead; requests then never stat it
+JOBS_WATCH = os.getenv("STARFUL_JOBS_WATCH", "0") == "1"
+# Hot-reload edited app/contents/*.md into listings without rebuilding job_data.json
+CONTENT_WATCH = os.getenv("STARFUL_CONTENT_WATCH", "0") == "1"
+# Memory-mapped job snapshot shared by the workers on a host, e.g.
+# /dev/shm/starful_jobs.snap (app.services.shared_snapshot); empty = per process
+SHARED_SNAPSHOT_FILE = os.getenv("STARFUL_SHARED_SNAPSHOT", "")
+
 FIRESTORE_STARR_FEEDBACK_LOGS = "starful_starr_feedback_logs"
 FIRESTORE_STARR_USAGE_LIMITS = "starful_starr_usage_limits"
 
@@ -12,23 +12,36 @@ def new_content_cutoff(days: int | None = None) -> str:
     return (date.today() - timedelta(days=span)).isoformat()
 
 
-def is_content_new(published: str | None, *, days: int | None = None) -> bool:
+def is_content_new(
+    published: str | None, *, days: int | None = None, cutoff: str | None = None
+) -> bool:
+    """`cutoff` (from new_content_cutoff) skips the date.today() call per item."""
     if not published:
         return False
     pub = str(published).strip()[:10]
     if len(pub) < 10:
         return False
-    return pub >= new_content_cutoff(days)
+    return pub >= (cutoff or new_content_cutoff(days))
 
 
-def enrich_item(item: dict[str, Any], *, days: int | None = None) -> dict[str, Any]:
+def enrich_item(
+    item: dict[str, Any], *, days: int | None = None, cutoff: str | None = None
+) -> dict[str, Any]:
+    with_badge = getattr(item, "with_badge", None)
+    if with_badge is not None:  # snapshot JobRecord: read-only view instead of a copy
+        pub = item.get("published") or item.get("date") or ""
+        published = str(pub)[:10] if pub else None
+        return with_badge(published, is_content_new(published, days=days, cutoff=cutoff))
     out = dict(item)
     pub = out.get("published") or out.get("date") or ""
     if pub:
         out["published"] = str(pub)[:10]
-    out["is_new"] = is_content_new(out.get("published"), days=days)
+    out["is_new"] = is_content_new(out.get("published"), days=days, cutoff=cutoff)
     return out
 
 
-def enrich_items(items: list[dict[str, Any]], *, days: int | None = None) -> list[dict[str, Any]]:
-    return [enrich_item(i, days=days) for i in items]
+def enrich_items(
+    items: list[dict[str, Any]], *, days: int | None = None, cutoff: str | None = None
+) -> list[dict[str, Any]]:
+    cutoff = cutoff or new_content_cutoff(days)
+    return [enrich_item(i, cutoff=cutoff) for i in items]
@@ -5,8 +5,12 @@ import json
 import re
 from typing import Any
 
-_JSON_BLOCK = re.compile(r"\A---json\s*(\{.*?\})\s*---(.*)", re.DOTALL)
-_YAML_BLOCK = re.compile(r"\A---\n(?!json)(.*?)\n---\n(.*)", re.DOTALL)
+# Frontmatter heads only; the body is whatever follows match.end().
+_JSON_HEAD = re.compile(r"\A---json\s*(\{.*?\})\s*---", re.DOTALL)
+_YAML_HEAD = re.compile(r"\A---\n(?!json)(.*?)\n---\n", re.DOTALL)
+
+# First read for read_starful_meta; doubled until the closing --- is in the window.
+FRONTMATTER_READ_SIZE = 4096
 
 
 def _parse_yaml_block(block: str) -> dict[str, Any]:
@@ -32,27 +36,76 @@ def _normalize_yaml_meta(raw: dict[str, Any]) -> dict[str, Any]:
     return meta
 
 
-def parse_starful_md_raw(raw: str) -> tuple[dict[str, Any], str] | None:
-    """Parse raw markdown content. Returns None if no recognized frontmatter."""
-    text = raw.lstrip("\ufeff")
+def _match_frontmatter(text: str) -> tuple[dict[str, Any], int] | None:
+    """(meta, body offset) for text starting with frontmatter, else None.
 
-    match = _JSON_BLOCK.match(text)
+    Works on a prefix of the file: a match found in a prefix is the same match the
+    full text would give, since both patterns stop at the first closing ---.
+    """
+    match = _JSON_HEAD.match(text)
     if match:
         try:
             meta = json.loads(match.group(1).strip())
         except json.JSONDecodeError:
             return None
-        return meta, match.group(2)
+        return meta, match.end()
 
-    match = _YAML_BLOCK.match(text)
+    match = _YAML_HEAD.match(text)
     if match:
         meta = _parse_yaml_block(match.group(1))
         if meta:
-            return meta, match.group(2)
+            return meta, match.end()
 
     return None
 
 
+def parse_starful_md_raw(raw: str) -> tuple[dict[str, Any], str] | None:
+    """Parse raw markdown content. Returns None if no recognized frontmatter."""
+    text = raw.lstrip("\ufeff")
+    parsed = _match_frontmatter(text)
+    if parsed is None:
+        return None
+    meta, offset = parsed
+    return meta, text[offset:]
+
+
+def parse_starful_meta_raw(raw: str) -> dict[str, Any] | None:
+    """Frontmatter only; None if the text does not start with recognized frontmatter."""
+    parsed = _match_frontmatter(raw.lstrip("\ufeff"))
+    return parsed[0] if parsed else None
+
+
+def read_starful_meta_file(filepath: str) -> dict[str, Any] | None:
+    """Read just enough of filepath to parse its frontmatter (None if unrecognized).
+
+    Reads FRONTMATTER_READ_SIZE characters, doubling the window until the closing
+    delimiter is found or the file ends. Raises OSError like open().
+    """
+    size = FRONTMATTER_READ_SIZE
+    with open(filepath, encoding="utf-8") as f:
+        text = f.read(size)
+        while True:
+            head = text.lstrip("\ufeff")
+            if not head.startswith("---"):
+                return None
+            parsed = _match_frontmatter(head)
+            if parsed is not None:
+                return parsed[0]
+            chunk = f.read(size)
+            if not chunk:
+                return None
+            text += chunk
+            size *= 2
+
+
+def read_starful_meta(filepath: str) -> dict[str, Any]:
+    """Frontmatter of a career markdown file; {} on missing file or parse failure."""
+    try:
+        return read_starful_meta_file(filepath) or {}
+    except Exception:
+        return {}
+
+
 def parse_starful_md(filepath: str) -> tuple[dict[str, Any], str]:
     """Parse a career markdown file (app runtime behavior).
 
@@ -6,8 +6,9 @@ from starlette.concurrency import run_in_threadpool
 
 from app.dependencies import db as firestore_db
 from app.utils.http import get_client_ip
+from app.utils.json_codec import FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 COLLECTION_NAME = os.getenv("REACTIONS_COLLECTION", "starful_biz")
 
 
@@ -13,8 +13,9 @@ from app.services.starr import (
     log_starr_feedback,
     parse_gemini_starr_response,
 )
+from app.utils.json_codec import FastJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 
 
 @router.post("/analyze-starr")
@@ -0,0 +1,38 @@
+"""Search box typeahead API."""
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, Query, Request
+
+from app.config import APP_REVISION, SUGGEST_MAX_AGE
+from app.services.jobs_cache import ensure_jobs_cache, jobs_check_due
+from app.services.suggest import SUGGEST_LIMIT, Suggester, snapshot_suggester
+from app.utils.http import make_etag, not_modified_response, validator_headers
+from app.utils.json_codec import FastJSONResponse
+
+router = APIRouter(default_response_class=FastJSONResponse)
+
+_EMPTY = Suggester((), {})
+
+
+@router.get("/suggest")
+async def suggest(
+    request: Request,
+    q: str = "",
+    limit: int = Query(SUGGEST_LIMIT, ge=1, le=SUGGEST_LIMIT),
+):
+    """Answered on the event loop: one trie walk over the suggester that the
+    reload path prebuilt for the current snapshot. Requests never build or reload."""
+    if jobs_check_due():
+        # Pick up job_data.json changes without making this keystroke wait.
+        asyncio.get_running_loop().run_in_executor(None, ensure_jobs_cache)
+    suggester = snapshot_suggester.latest() or _EMPTY
+    etag = make_etag("suggest", APP_REVISION, suggester.version, q, limit)
+    headers = {"Cache-Control": f"public, max-age={SUGGEST_MAX_AGE}"}
+    not_modified = not_modified_response(request, etag, suggester.mtime)
+    if not_modified is not None:
+        not_modified.headers.update(headers)
+        return not_modified
+    headers.update(validator_headers(etag, suggester.mtime))
+    return FastJSONResponse(suggester.suggest(q, limit), headers=headers)
@@ -1,70 +1,98 @@
 """Non-SEO page routes: home, search, practice, about, privacy, mbti."""
 from __future__ import annotations
 
-from datetime import date
-
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import RedirectResponse
 
 from app.affiliate import affiliate_context
-from app.config import BASE_URL, CAREER_CATEGORIES
-from app.content_new import enrich_items
+from app.config import BASE_URL
 from app.seo_helpers import (
     faq_page_json_ld,
-    featured_jobs_from_data,
     is_junk_search_query,
     merge_career_json_ld,
 )
-from app.services.jobs_cache import JOB_DATA, ensure_jobs_cache
-from app.services.mbti import get_mbti_type, list_mbti_types, normalize_mbti_type
-from app.services.search import search_jobs
+from app.services.compression import cached_page
+from app.services.derived_views import derived_view
+from app.services.home_view import home_view_model
+from app.services.job_snapshot import JobSnapshot
+from app.services.jobs_cache import current_snapshot, ensure_jobs_cache
+from app.services.mbti import (
+    get_mbti_type,
+    list_mbti_types,
+    mbti_data_mtime,
+    normalize_mbti_type,
+)
+from app.services.page_executor import run_page_work
+from app.services.page_versions import page_validators
+from app.services.search import body_snippets, current_body_index, search_snapshot
 from app.templating import templates
+from app.utils.http import not_modified_response, validator_headers
 
 router = APIRouter()
 
+# Results on /search that get a body excerpt (search_results.html)
+SEARCH_SNIPPETS = 30
+
 
 @router.get("/")
 async def home(request: Request):
+    return await run_page_work(_home, request)
+
+
+def _home(request: Request):
     ensure_jobs_cache()
-    grouped_items = []
-    all_jobs = JOB_DATA.get("jobs", [])
-    for cat in CAREER_CATEGORIES:
-        items = enrich_items(
-            [j for j in all_jobs if j.get("category", "").lower() == cat["slug"].lower()]
-        )
-        items.sort(key=lambda x: (x.get("published", ""), x.get("id", "")), reverse=True)
-        if items:
-            cat_copy = cat.copy()
-            cat_copy["job_items"] = items
-            grouped_items.append(cat_copy)
-
-    featured_jobs = enrich_items(featured_jobs_from_data(all_jobs))
+    # One snapshot per request: the ETag and the body describe the same data.
+    snapshot = current_snapshot()
+    etag, last_modified = page_validators(
+        "home",
+        request.url.query,
+        snapshot.mtime,
+        mtimes=(snapshot.mtime,),
+        daily=True,
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return cached_page(
+        request,
+        etag,
+        validator_headers(etag, last_modified),
+        lambda: _render_home(request, snapshot),
+        # base.html echoes the query into canonical / og:url; don't store per URL.
+        store=not request.url.query,
+    )
 
+
+def _render_home(request: Request, snapshot: JobSnapshot):
     return templates.TemplateResponse(
         request=request,
         name="index.html",
-        context={
-            "grouped_items": grouped_items,
-            "total_count": JOB_DATA.get("total_count", 0),
-            "last_updated": JOB_DATA.get("last_updated", date.today().isoformat()),
-            "featured_jobs": featured_jobs,
-        },
+        context=dict(home_view_model(snapshot)),
     )
 
 
 @router.get("/practice")
 async def practice_page(request: Request):
-    ensure_jobs_cache()
+    return await run_page_work(_practice_page, request)
+
+
+@derived_view("practice_options")
+def _practice_options(snapshot: JobSnapshot) -> tuple[dict[str, str], ...]:
     career_opts = [
         {"id": j.get("id", ""), "title": j.get("title", "")}
-        for j in JOB_DATA.get("jobs", [])
+        for j in snapshot.jobs
         if j.get("title")
     ]
     career_opts.sort(key=lambda x: x["title"])
+    return tuple(career_opts)
+
+
+def _practice_page(request: Request):
+    ensure_jobs_cache()
     return templates.TemplateResponse(
         request=request,
         name="practice.html",
-        context={"career_options": career_opts},
+        context={"career_options": _practice_options.get(current_snapshot())},
     )
 
 
@@ -72,12 +100,26 @@ async def practice_page(request: Request):
 async def search(request: Request, q: str = ""):
     if is_junk_search_query(q):
         return RedirectResponse(f"{BASE_URL}/", status_code=301)
+    return await run_page_work(_search, request, q)
+
+
+def _search(request: Request, q: str):
     ensure_jobs_cache()
-    results = search_jobs(JOB_DATA.get("jobs", []), q)
+    snapshot = current_snapshot()
+    # One body version for both ranking and snippets, even if the file changes meanwhile.
+    body = current_body_index()
+    results = search_snapshot(snapshot, q, body)
+    snippets = body_snippets([job.get("id", "") for job in results[:SEARCH_SNIPPETS]], q, body[0])
     return templates.TemplateResponse(
         request=request,
         name="search_results.html",
-        context={"items": results, "query": q, "results_count": len(results)},
+        context={
+            "items": results,
+            "query": q,
+            "results_count": len(results),
+            "snippets": snippets,
+            "img_urls": snapshot.img_urls,
+        },
     )
 
 
@@ -107,13 +149,40 @@ async def mbti_index(request: Request):
 
 @router.get("/mbti/{type_code}")
 async def mbti_type_page(request: Request, type_code: str):
+    return await run_page_work(_mbti_type_page, request, type_code)
+
+
+def _mbti_type_page(request: Request, type_code: str):
     normalized = normalize_mbti_type(type_code)
     if not normalized:
         raise HTTPException(status_code=404)
     if type_code != normalized:
         return RedirectResponse(f"{BASE_URL}/mbti/{normalized}", status_code=301)
 
-    payload = get_mbti_type(normalized)
+    ensure_jobs_cache()
+    snapshot = current_snapshot()
+    etag, last_modified = page_validators(
+        "mbti",
+        normalized,
+        request.url.query,
+        snapshot.mtime,
+        mbti_data_mtime(),
+        mtimes=(snapshot.mtime, mbti_data_mtime()),
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return cached_page(
+        request,
+        etag,
+        validator_headers(etag, last_modified),
+        lambda: _render_mbti_type(request, normalized, snapshot),
+        store=not request.url.query,
+    )
+
+
+def _render_mbti_type(request: Request, normalized: str, snapshot: JobSnapshot):
+    payload = get_mbti_type(normalized, snapshot)
     if not payload:
         raise HTTPException(status_code=404)
 
@@ -2,35 +2,51 @@
 from __future__ import annotations
 
 import os
-import re
 from datetime import date
 from urllib.parse import urljoin
 
-import markdown
 from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.exception_handlers import http_exception_handler
-from fastapi.responses import FileResponse, PlainTextResponse, RedirectResponse, Response
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    PlainTextResponse,
+    RedirectResponse,
+    Response,
+)
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.affiliate import affiliate_context
-from app.config import BASE_URL, BRAND_LOGO_FILE, CONTENTS_DIR, GCS_IMG_BASE, STATIC_DIR
-from app.md_parser import parse_starful_md
+from app.career_render import RENDER_VERSION
+from app.config import BASE_URL, CAREER_INLINE_SECTIONS, GCS_IMG_BASE, STATIC_DIR, STREAM_PAGES
 from app.seo_helpers import (
     FEATURED_CAREER_SLUGS,
     canonical_career_url,
-    extract_faq_from_markdown,
-    faq_page_json_ld,
-    featured_jobs_from_data,
     is_junk_search_query,
     is_removed_career,
     legacy_query_should_drop_to_home,
     legacy_redirect_target,
-    merge_career_json_ld,
     resolve_career_id,
 )
-from app.services.jobs_cache import JOB_DATA, ensure_jobs_cache, related_careers_from_meta
-from app.services.mbti import all_mbti_type_codes, types_for_career
+from app.services.career_pages import (
+    career_page_cache,
+    career_section_fragment,
+    career_source_stat,
+    inline_career_content,
+)
+from app.services.compression import cached_page
+from app.services.derived_views import derived_view
+from app.services.job_snapshot import JobSnapshot
+from app.services.jobs_cache import (
+    current_snapshot,
+    ensure_jobs_cache,
+    related_careers_from_meta,
+)
+from app.services.mbti import all_mbti_type_codes, mbti_data_mtime, types_for_career
 from app.services.media import career_img_url, gcs_or_static_img
+from app.services.page_executor import run_page_work
+from app.services.page_stream import streamed_page
+from app.services.page_versions import page_validators
 from app.social_share import (
     card_page_path,
     career_thumbnail_url,
@@ -39,6 +55,7 @@ from app.social_share import (
     share_context,
 )
 from app.templating import templates
+from app.utils.http import make_etag, not_modified_response, validator_headers
 
 router = APIRouter()
 
@@ -101,7 +118,8 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
             request=request,
             name="404.html",
             context={
-                "featured_jobs": featured_jobs_from_data(JOB_DATA.get("jobs", [])),
+                # Computed once per snapshot (JobSnapshot.featured); not copied.
+                "featured_jobs": current_snapshot().featured,
             },
             status_code=404,
         )
@@ -125,8 +143,14 @@ async def favicon_root():
 
 @router.get("/career/{item_id}")
 async def career_detail(request: Request, item_id: str):
+    return await run_page_work(_career_detail, request, item_id)
+
+
+def _career_detail(request: Request, item_id: str):
     ensure_jobs_cache()
-    resolved_id = resolve_career_id(item_id)
+    # One snapshot per request: the ETag and the body describe the same data.
+    snapshot = current_snapshot()
+    resolved_id = snapshot.resolve(item_id)
     if is_removed_career(resolved_id) or is_removed_career(item_id):
         return RedirectResponse(f"{BASE_URL}/", status_code=301)
     if resolved_id != item_id:
@@ -135,82 +159,83 @@ async def career_detail(request: Request, item_id: str):
             target = f"{target}?{request.url.query}"
         return RedirectResponse(target, status_code=301)
 
-    filepath = os.path.join(CONTENTS_DIR, f"{resolved_id}.md")
-    if not os.path.exists(filepath):
+    source = career_source_stat(resolved_id)
+    if source is None:
         raise HTTPException(status_code=404)
-    meta, body = parse_starful_md(filepath)
-    content_html = markdown.markdown(body, extensions=["tables"])
-    cache_v = str(meta.get("published_at") or "")[:10]
-    if len(cache_v) >= 8:
-        content_html = re.sub(
-            r'(/static/img/[^"\'?\s>]+)',
-            lambda m: m.group(1) if "?v=" in m.group(1) else f"{m.group(1)}?v={cache_v}",
-            content_html,
+    etag, last_modified = page_validators(
+        "career",
+        resolved_id,
+        source.st_mtime_ns,
+        source.st_size,
+        RENDER_VERSION,
+        CAREER_INLINE_SECTIONS,
+        _career_links_key.get(snapshot),
+        mbti_data_mtime(),
+        mtimes=(source.st_mtime, snapshot.mtime, mbti_data_mtime()),
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    headers = validator_headers(etag, last_modified)
+    if STREAM_PAGES:
+        return streamed_page(
+            request,
+            etag,
+            headers,
+            lambda: _career_detail_template(resolved_id, source, snapshot),
         )
+    return cached_page(
+        request,
+        etag,
+        headers,
+        lambda: _render_career_detail(request, resolved_id, source, snapshot),
+    )
+
+
+@derived_view("career_links")
+def _career_links_key(snapshot: JobSnapshot) -> str:
+    """What a career page shows from the snapshot besides its own Markdown:
+    featured cards and related-job titles. Other jobs' edits keep its ETag."""
+    return make_etag(
+        [tuple(job.items()) for job in snapshot.featured],
+        sorted((job.get("id", ""), job.get("title", "")) for job in snapshot.jobs),
+    )
+
+
+def _render_career_detail(
+    request: Request, resolved_id: str, source: os.stat_result, snapshot: JobSnapshot
+):
+    name, context = _career_detail_template(resolved_id, source, snapshot)
+    return templates.TemplateResponse(request=request, name=name, context=context)
+
+
+def _career_detail_template(
+    resolved_id: str, source: os.stat_result, snapshot: JobSnapshot
+) -> tuple[str, dict]:
+    page = career_page_cache.get(resolved_id, source)
+    if page is None:
+        raise HTTPException(status_code=404)
+    meta = page["meta"]
     canonical = canonical_career_url(BASE_URL, resolved_id)
     title = meta.get("title", "面接ガイド")
     ctx = share_context(BASE_URL, resolved_id, title)
-    social_image = ctx["og_image_abs"]
-    article_ld = {
-        "@context": "https://schema.org",
-        "@type": "Article",
-        "headline": meta.get("title", ""),
-        "description": (meta.get("meta_description") or "")[:300],
-        "image": [social_image],
-        "mainEntityOfPage": {"@type": "WebPage", "@id": canonical},
-        "author": {"@type": "Organization", "name": "Starful"},
-        "publisher": {
-            "@type": "Organization",
-            "name": "Starful",
-            "url": BASE_URL,
-            "logo": {
-                "@type": "ImageObject",
-                "url": f"{BASE_URL}/static/img/{BRAND_LOGO_FILE}",
-            },
-        },
-    }
-    pub = meta.get("published_at")
-    if pub:
-        article_ld["datePublished"] = str(pub)
-    breadcrumb_ld = {
-        "@context": "https://schema.org",
-        "@type": "BreadcrumbList",
-        "itemListElement": [
-            {
-                "@type": "ListItem",
-                "position": 1,
-                "name": "ホーム",
-                "item": f"{BASE_URL}/",
-            },
-            {
-                "@type": "ListItem",
-                "position": 2,
-                "name": meta.get("title", "面接ガイド")[:80],
-                "item": canonical,
-            },
-        ],
-    }
-    faq_items = extract_faq_from_markdown(body)
-    faq_ld = faq_page_json_ld(faq_items, canonical)
-    json_ld_career = merge_career_json_ld([article_ld, breadcrumb_ld], faq_ld)
-
-    all_featured = featured_jobs_from_data(JOB_DATA.get("jobs", []))
-    featured_others = [j for j in all_featured if j.get("id") != resolved_id][:8]
+
+    featured_others = [j for j in snapshot.featured if j.get("id") != resolved_id][:8]
     mbti_types = types_for_career(resolved_id)
 
-    return templates.TemplateResponse(
-        request=request,
-        name="detail.html",
-        context={
+    return (
+        "detail.html",
+        {
             "item": meta,
-            "content": content_html,
+            "content": inline_career_content(resolved_id, page),
             "category_title": meta.get("category", "Career"),
             "career_id": resolved_id,
             "canonical_url": canonical,
-            "related_careers": related_careers_from_meta(meta),
+            "related_careers": related_careers_from_meta(meta, snapshot),
             "featured_careers": featured_others,
             "mbti_types": mbti_types,
-            "json_ld_career": json_ld_career,
+            "json_ld_career": page["json_ld_career"],
             **affiliate_context(
                 career_id=resolved_id,
                 category=str(meta.get("category") or ""),
@@ -221,8 +246,84 @@ async def career_detail(request: Request, item_id: str):
     )
 
 
+@router.get("/career/{item_id}/section/{n}")
+async def career_section(request: Request, item_id: str, n: int):
+    """HTML fragment for a deferred guide section (fetched by detail.html)."""
+    return await run_page_work(_career_section, request, item_id, n)
+
+
+def _career_section(request: Request, item_id: str, n: int):
+    ensure_jobs_cache()
+    # Same alias / removal rules as /career/{item_id}.
+    resolved_id = current_snapshot().resolve(item_id)
+    if is_removed_career(resolved_id) or is_removed_career(item_id):
+        raise HTTPException(status_code=404)
+    source = career_source_stat(resolved_id)
+    if source is None:
+        raise HTTPException(status_code=404)
+    etag, last_modified = page_validators(
+        "career-section",
+        resolved_id,
+        source.st_mtime_ns,
+        source.st_size,
+        RENDER_VERSION,
+        n,
+        mtimes=(source.st_mtime,),
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    headers = validator_headers(etag, last_modified)
+    headers["X-Robots-Tag"] = "noindex"
+    # Fragments are cut from career_page_cache entries; storing them in page_store
+    # would only evict full pages.
+    return cached_page(
+        request,
+        etag,
+        headers,
+        lambda: _render_career_section(resolved_id, source, n),
+        store=False,
+    )
+
+
+def _render_career_section(resolved_id: str, source: os.stat_result, n: int) -> Response:
+    page = career_page_cache.get(resolved_id, source)
+    fragment = career_section_fragment(page, n) if page is not None else None
+    if fragment is None:
+        raise HTTPException(status_code=404)
+    return HTMLResponse(fragment)
+
+
 @router.get("/sitemap.xml")
-async def sitemap():
+async def sitemap(request: Request):
+    return await run_page_work(_sitemap, request)
+
+
+def _sitemap(request: Request):
+    ensure_jobs_cache()
+    snapshot = current_snapshot()
+    etag, last_modified = page_validators(
+        "sitemap",
+        BASE_URL,
+        snapshot.mtime,
+        mtimes=(snapshot.mtime,),
+        daily=True,
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return cached_page(
+        request, etag, validator_headers(etag, last_modified), lambda: _render_sitemap(snapshot)
+    )
+
+
+def _render_sitemap(snapshot: JobSnapshot) -> Response:
+    return Response(content=_sitemap_xml.get(snapshot), media_type="application/xml")
+
+
+@derived_view("sitemap_xml", daily=True)
+def _sitemap_xml(snapshot: JobSnapshot) -> str:
     static_paths = [
         ("/", "daily", "1.0"),
         ("/practice", "weekly", "0.85"),
@@ -249,7 +350,7 @@ async def sitemap():
             f"<changefreq>monthly</changefreq><priority>0.75</priority></url>"
         )
 
-    for job in JOB_DATA.get("jobs", []):
+    for job in snapshot.jobs:
         jid = job.get("id", "")
         if not jid:
             continue
@@ -261,13 +362,12 @@ async def sitemap():
             f"<changefreq>monthly</changefreq><priority>{priority}</priority></url>"
         )
 
-    xml = (
+    return (
         '<?xml version="1.0" encoding="UTF-8"?>'
         '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
         + "".join(urls)
         + "</urlset>"
     )
-    return Response(content=xml, media_type="application/xml")
 
 
 @router.get("/ads.txt")
@@ -319,6 +419,10 @@ async def social_image(image_key: str):
 
 @router.api_route("/card/career/{career_id}", methods=["GET", "HEAD"])
 async def career_social_card(request: Request, career_id: str):
+    return await run_page_work(_career_social_card, request, career_id)
+
+
+def _career_social_card(request: Request, career_id: str):
     resolved_id = resolve_career_id(career_id)
     if is_removed_career(resolved_id) or is_removed_career(career_id):
         return RedirectResponse(f"{BASE_URL}/", status_code=301)
@@ -328,10 +432,9 @@ async def career_social_card(request: Request, career_id: str):
             target = f"{target}&{request.url.query}" if "?" in target else f"{target}?{request.url.query}"
         return RedirectResponse(target, status_code=301)
 
-    filepath = os.path.join(CONTENTS_DIR, f"{resolved_id}.md")
-    if not os.path.exists(filepath):
+    meta = career_page_cache.meta(resolved_id)
+    if meta is None:
         raise HTTPException(status_code=404)
-    meta, _ = parse_starful_md(filepath)
     title = meta.get("title", "面接ガイド")
     ctx = share_context(BASE_URL, resolved_id, title)
     page = f"{BASE_URL}{detail_page_path(resolved_id)}"
@@ -0,0 +1,299 @@
+"""Rendered career page cache (LRU keyed by Markdown mtime/size).
+
+Pages come from the build-time bundle (scripts/build_data.py → PRERENDER_FILE) when
+its entry matches the Markdown file on disk, otherwise they are rendered live.
+"""
+from __future__ import annotations
+
+import html as html_lib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from app.career_render import RENDER_VERSION, render_career_artifact, split_sections
+from app.config import (
+    BASE_URL,
+    BRAND_LOGO_FILE,
+    CAREER_INLINE_SECTIONS,
+    CAREER_RENDER_CACHE_SIZE,
+    CONTENTS_DIR,
+    PRERENDER_FILE,
+)
+from app.md_parser import parse_starful_md, read_starful_meta
+from app.seo_helpers import (
+    canonical_career_url,
+    extract_faq_from_markdown,
+    faq_page_json_ld,
+    merge_career_json_ld,
+)
+from app.social_share import social_image_url
+from app.utils import json_codec
+
+
+def career_md_path(career_id: str) -> str:
+    return os.path.join(CONTENTS_DIR, f"{career_id}.md")
+
+
+def career_source_stat(career_id: str) -> os.stat_result | None:
+    try:
+        return os.stat(career_md_path(career_id))
+    except OSError:
+        return None
+
+
+def career_json_ld(meta: dict[str, Any], career_id: str, faq_items: list[dict]) -> dict[str, Any]:
+    """Article + BreadcrumbList (+ FAQPage) @graph for detail.html."""
+    canonical = canonical_career_url(BASE_URL, career_id)
+    article_ld = {
+        "@context": "https://schema.org",
+        "@type": "Article",
+        "headline": meta.get("title", ""),
+        "description": (meta.get("meta_description") or "")[:300],
+        "image": [social_image_url(BASE_URL, career_id)],
+        "mainEntityOfPage": {"@type": "WebPage", "@id": canonical},
+        "author": {"@type": "Organization", "name": "Starful"},
+        "publisher": {
+            "@type": "Organization",
+            "name": "Starful",
+            "url": BASE_URL,
+            "logo": {
+                "@type": "ImageObject",
+                "url": f"{BASE_URL}/static/img/{BRAND_LOGO_FILE}",
+            },
+        },
+    }
+    pub = meta.get("published_at")
+    if pub:
+        article_ld["datePublished"] = str(pub)
+    breadcrumb_ld = {
+        "@context": "https://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {
+                "@type": "ListItem",
+                "position": 1,
+                "name": "ホーム",
+                "item": f"{BASE_URL}/",
+            },
+            {
+                "@type": "ListItem",
+                "position": 2,
+                "name": meta.get("title", "面接ガイド")[:80],
+                "item": canonical,
+            },
+        ],
+    }
+    faq_ld = faq_page_json_ld(faq_items, canonical)
+    return merge_career_json_ld([article_ld, breadcrumb_ld], faq_ld)
+
+
+def build_career_page(
+    career_id: str, meta: dict[str, Any], artifact: dict[str, Any], faq_items: list[dict]
+) -> dict[str, Any]:
+    return {
+        "meta": meta,
+        "content": artifact["content"],
+        "toc": artifact.get("toc") or [],
+        "word_count": artifact.get("word_count", 0),
+        "section_offsets": artifact.get("section_offsets") or [],
+        "faq_items": faq_items,
+        "json_ld_career": career_json_ld(meta, career_id, faq_items),
+    }
+
+
+def career_section_path(career_id: str, n: int) -> str:
+    return f"/career/{career_id}/section/{n}"
+
+
+def career_sections(page: dict[str, Any]) -> list[str]:
+    return split_sections(page["content"], page.get("section_offsets") or [])
+
+
+def _split_heading(section: str) -> tuple[str, str]:
+    """(leading <h2>…</h2>, rest) of a section; ("", section) for the intro."""
+    end = section.find("</h2>")
+    if not section.startswith("<h2") or end < 0:
+        return "", section
+    end += len("</h2>")
+    return section[:end], section[end:]
+
+
+def inline_career_content(
+    career_id: str, page: dict[str, Any], inline_sections: int = CAREER_INLINE_SECTIONS
+) -> str:
+    """Article HTML with sections after the first inline_sections deferred.
+
+    Deferred sections keep their H2 (TOC anchors and headings stay in the page) and
+    an empty body that detail.html fills from career_section_path on scroll.
+    """
+    sections = career_sections(page)
+    if inline_sections <= 0 or len(sections) <= inline_sections:
+        return page["content"]
+    parts = sections[:inline_sections]
+    for n in range(inline_sections, len(sections)):
+        heading, _ = _split_heading(sections[n])
+        src = html_lib.escape(career_section_path(career_id, n))
+        parts.append(
+            f'<section class="career-section-deferred" data-section-src="{src}">\n'
+            f'{heading}\n<div class="career-section-body"></div>\n</section>\n'
+        )
+    return "".join(parts)
+
+
+def career_section_fragment(page: dict[str, Any], n: int) -> str | None:
+    """Body of section n without its H2 (the placeholder already has it)."""
+    sections = career_sections(page)
+    if not 0 <= n < len(sections):
+        return None
+    return _split_heading(sections[n])[1]
+
+
+def render_career_page(career_id: str, filepath: str) -> dict[str, Any]:
+    meta, body = parse_starful_md(filepath)
+    artifact = render_career_artifact(meta, body)
+    return build_career_page(career_id, meta, artifact, extract_faq_from_markdown(body))
+
+
+class PrerenderedBundle:
+    """career_pages.json written at build time; reloaded when the file changes."""
+
+    def __init__(self, path: str = PRERENDER_FILE):
+        self.path = path
+        self._careers: dict[str, dict[str, Any]] = {}
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = 0.0
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            careers: dict[str, dict[str, Any]] = {}
+            if mtime:
+                try:
+                    data = json_codec.load_file(self.path)
+                    if data.get("version") == RENDER_VERSION:
+                        careers = data.get("careers") or {}
+                    else:
+                        print(f"⚠️ Prerender bundle version {data.get('version')!r} is stale; rendering live.")
+                except Exception as e:
+                    print(f"❌ [Error] Failed to load prerender bundle: {e}")
+            self._careers = careers
+            self._mtime = mtime
+
+    def entry(self, career_id: str, st: os.stat_result) -> dict[str, Any] | None:
+        """Bundle entry for career_id if it was built from the file described by st."""
+        self._refresh()
+        entry = self._careers.get(career_id)
+        if not entry:
+            return None
+        source = entry.get("source") or {}
+        if source.get("mtime") != int(st.st_mtime) or source.get("size") != st.st_size:
+            return None
+        return entry
+
+
+class CareerPageCache:
+    """Bounded LRU of rendered career pages.
+
+    Entries are keyed by (career_id, mtime_ns, size) of the Markdown source, so an
+    edited file simply misses and the stale entry ages out.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = CAREER_RENDER_CACHE_SIZE,
+        bundle: PrerenderedBundle | None = None,
+    ):
+        self.maxsize = max(0, maxsize)
+        self.bundle = bundle if bundle is not None else PrerenderedBundle()
+        self._entries: OrderedDict[tuple[str, int, int], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prerendered = 0
+        self.rendered = 0
+
+    def get(self, career_id: str, st: os.stat_result | None = None) -> dict[str, Any] | None:
+        """Rendered page for career_id, or None when the Markdown file is missing.
+
+        Pass st (from career_source_stat) when the caller already stat'ed the file.
+        """
+        filepath = career_md_path(career_id)
+        if st is None:
+            st = career_source_stat(career_id)
+            if st is None:
+                return None
+        key = (career_id, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        prerendered = self.bundle.entry(career_id, st)
+        if prerendered is not None:
+            meta = prerendered.get("meta") or {}
+            entry = build_career_page(career_id, meta, prerendered, prerendered.get("faq_items") or [])
+            self.prerendered += 1
+        else:
+            entry = render_career_page(career_id, filepath)
+            self.rendered += 1
+        self._store(key, entry)
+        return entry
+
+    def meta(self, career_id: str) -> dict[str, Any] | None:
+        """Frontmatter only (social cards); avoids rendering when the bundle is fresh."""
+        filepath = career_md_path(career_id)
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        prerendered = self.bundle.entry(career_id, st)
+        if prerendered is not None:
+            return prerendered.get("meta") or {}
+        return read_starful_meta(filepath)
+
+    def _store(self, key: tuple[str, int, int], entry: dict[str, Any]) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, career_id: str) -> None:
+        """Drop every cached version of one career (content hot reload)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == career_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "prerendered": self.prerendered,
+                "rendered": self.rendered,
+            }
+
+
+career_page_cache = CareerPageCache()
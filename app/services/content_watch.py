@@ -0,0 +1,157 @@
+"""Hot reload of app/contents/*.md into the job snapshot (STARFUL_CONTENT_WATCH=1).
+
+Each check lists the directory (one stat per file) and re-reads added or changed
+files only. Their guide texts are patched into the body search index, their job
+entries merged into the current snapshot (jobs_cache.apply_job_updates) and
+their rendered pages dropped from career_page_cache. A body-only edit leaves the
+job entry, and so the snapshot and every listing ETag, unchanged; the search
+index and result cache are patched for the changed ids only. job_data.json
+stays the startup source: files are compared with the directory as first seen,
+and scripts/build_data.py still has to run for the change to survive a restart.
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from typing import Any
+
+from app.config import CONTENTS_DIR, JOBS_CHECK_INTERVAL
+from app.md_parser import parse_starful_md_raw, read_starful_meta_file
+from app.services.career_pages import career_page_cache
+from app.services.file_watch import PollingWatcher
+from app.services.job_records import career_id_for, job_from_meta
+from app.services.jobs_cache import apply_job_updates, current_snapshot
+from app.services.search import body_index_file
+from app.services.text_index import markdown_plain_text
+
+# filename → (st_mtime_ns, st_size)
+Fingerprints = dict[str, tuple[int, int]]
+
+
+def _published_date(meta: dict[str, Any], st: os.stat_result) -> str:
+    """As scripts/md_metadata.published_date: frontmatter date, else file mtime."""
+    pub = meta.get("published_at") or meta.get("published")
+    if pub:
+        return str(pub).strip()[:10]
+    return datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d")
+
+
+class ContentScanner:
+    """Diffs a contents directory against the previous scan and applies the changes."""
+
+    def __init__(self, directory: str = CONTENTS_DIR):
+        self.directory = directory
+        self._seen: Fingerprints | None = None
+        # filename → job id (career_id_for), so a deleted file maps to its job
+        self._ids: dict[str, str] = {}
+        self.reloads = 0
+        self.files_parsed = 0
+
+    def _scan(self) -> tuple[Fingerprints, dict[str, os.stat_result]]:
+        prints: Fingerprints = {}
+        stats: dict[str, os.stat_result] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".md") and entry.is_file():
+                    st = entry.stat()
+                    prints[entry.name] = (st.st_mtime_ns, st.st_size)
+                    stats[entry.name] = st
+        return prints, stats
+
+    def _baseline(self, names: list[str]) -> None:
+        # job_data.json already describes these files; only their ids are needed.
+        for name in names:
+            try:
+                meta = read_starful_meta_file(os.path.join(self.directory, name)) or {}
+            except (OSError, ValueError):
+                meta = {}
+            self._ids[name] = career_id_for(name, meta)
+
+    def _changed_at(self, names: list[str], stats: dict[str, os.stat_result], deleted: bool) -> float:
+        """When the change happened on disk, for the snapshot mtime (listing ETags,
+        Last-Modified): the newest st_mtime of the changed files, or of the
+        directory when files were deleted. A copy restored with an older mtime
+        uses its st_ctime instead, so the snapshot mtime still moves forward.
+        Every worker sees the same files, so they publish the same value."""
+        stamps = [stats[name].st_mtime for name in names]
+        if deleted:
+            try:
+                stamps.append(os.stat(self.directory).st_mtime)
+            except OSError:
+                pass
+        changed_at = max(stamps, default=0.0)
+        if changed_at <= current_snapshot().mtime and names:
+            changed_at = max(stats[name].st_ctime for name in names)
+        return changed_at
+
+    def check(self) -> list[str]:
+        """Apply changes since the last check; returns the affected career ids."""
+        try:
+            current, stats = self._scan()
+        except OSError:
+            return []
+        previous, self._seen = self._seen, current
+        if previous is None:
+            self._baseline(list(current))
+            return []
+        changed = [name for name, fp in current.items() if previous.get(name) != fp]
+        gone = [name for name in previous if name not in current]
+        if not changed and not gone:
+            return []
+
+        removed = [self._ids.pop(name, None) or career_id_for(name, {}) for name in gone]
+        upserts: list[dict[str, Any]] = []
+        texts: dict[str, str | None] = {}
+        for name in changed:
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    parsed = parse_starful_md_raw(f.read())
+            except (OSError, ValueError) as e:
+                print(f"❌ [Error] Failed to read {name}: {e}")
+                continue
+            self.files_parsed += 1
+            old_id = self._ids.pop(name, None)
+            if not parsed:  # build_data skips files without frontmatter
+                if old_id:
+                    removed.append(old_id)
+                continue
+            meta, body = parsed
+            career_id = career_id_for(name, meta)
+            self._ids[name] = career_id
+            if old_id and old_id != career_id:  # slug changed
+                removed.append(old_id)
+            upserts.append(job_from_meta(career_id, meta, _published_date(meta, stats[name])))
+            texts[career_id] = markdown_plain_text(body)
+        texts.update((career_id, None) for career_id in removed if career_id not in texts)
+
+        # Body first: searches that see the new snapshot must see the new texts.
+        body_index_file.patch(texts)
+        # Unchanged job entries are no-ops.
+        apply_job_updates(upserts, removed, self._changed_at(changed, stats, bool(gone)))
+        affected = list(dict.fromkeys([job["id"] for job in upserts] + removed))
+        for career_id in affected:
+            career_page_cache.discard(career_id)
+        self.reloads += 1
+        print(f"🔄 [Content] Reloaded {len(upserts)} changed, {len(removed)} removed guide(s).")
+        return affected
+
+
+_WATCHER: PollingWatcher | None = None
+
+
+def start_content_watcher(directory: str = CONTENTS_DIR, interval: float | None = None) -> None:
+    global _WATCHER
+    if _WATCHER is None:
+        scanner = ContentScanner(directory)
+        scanner.check()  # baseline
+        _WATCHER = PollingWatcher(
+            "content-watcher", scanner.check, interval or JOBS_CHECK_INTERVAL or 1.0
+        )
+        _WATCHER.start()
+
+
+def stop_content_watcher() -> None:
+    global _WATCHER
+    if _WATCHER is not None:
+        _WATCHER.stop()
+        _WATCHER = None
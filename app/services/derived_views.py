@@ -0,0 +1,130 @@
+"""Values derived from a job snapshot, computed once per snapshot version (and day).
+
+A DerivedView caches one value per key: (snapshot version,) or, for daily views
+whose output depends on today's date, (snapshot version, ISO date). Values are
+shared by every request until the key changes, so treat them as read-only.
+A view with an updater (view.updater) patches the value of the snapshot an
+update_job_snapshot result was derived from instead of building from scratch.
+Eager views are built by jobs_cache as soon as a snapshot is published
+(prebuild_derived_views), so readers that must not block can use view.latest().
+Every view registers itself; derived_view_stats() lists size and compute time.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date
+from typing import Any, Callable, Generic, TypeVar
+
+from app.services.job_snapshot import JobSnapshot
+
+T = TypeVar("T")
+
+_REGISTRY: dict[str, "DerivedView[Any]"] = {}
+
+
+class DerivedView(Generic[T]):
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[JobSnapshot], T],
+        *,
+        daily: bool = False,
+        eager: bool = False,
+        size: Callable[[T], int] = len,  # type: ignore[assignment]
+    ):
+        self.name = name
+        self.build = build
+        self.daily = daily
+        self.eager = eager
+        self.size = size
+        # update(previous value, snapshot) for snapshot.changed; see updater().
+        self.update: Callable[[T, JobSnapshot], T] | None = None
+        # (key, value); replaced whole, so readers need no lock. Two threads may
+        # build the same key concurrently; either result is fine to keep.
+        self._cached: tuple[tuple[Any, ...], T] | None = None
+        self.builds = 0
+        self.updates = 0
+        self.hits = 0
+        self.last_build_ms = 0.0
+        _REGISTRY[name] = self
+
+    def _key(self, version: int) -> tuple[Any, ...]:
+        if self.daily:
+            return (version, date.today().isoformat())
+        return (version,)
+
+    def key(self, snapshot: JobSnapshot) -> tuple[Any, ...]:
+        return self._key(snapshot.version)
+
+    def updater(self, update: Callable[[T, JobSnapshot], T]) -> Callable[[T, JobSnapshot], T]:
+        """Decorator: patch the cached value when only snapshot.changed jobs differ."""
+        self.update = update
+        return update
+
+    def latest(self) -> T | None:
+        """The most recently built value, whatever snapshot it is for; never builds."""
+        cached = self._cached
+        return cached[1] if cached is not None else None
+
+    def get(self, snapshot: JobSnapshot) -> T:
+        key = self.key(snapshot)
+        cached = self._cached
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        started = time.perf_counter()
+        if (
+            cached is not None
+            and self.update is not None
+            and snapshot.changed is not None
+            and cached[0] == self._key(snapshot.changed[0])
+        ):
+            value = self.update(cached[1], snapshot)
+            self.updates += 1
+        else:
+            value = self.build(snapshot)
+            self.builds += 1
+        self.last_build_ms = (time.perf_counter() - started) * 1000
+        self._cached = (key, value)
+        return value
+
+    def clear(self) -> None:
+        self._cached = None
+
+    def stats(self) -> dict[str, Any]:
+        cached = self._cached
+        return {
+            "name": self.name,
+            "key": cached[0] if cached else None,
+            "size": self.size(cached[1]) if cached else 0,
+            "builds": self.builds,
+            "updates": self.updates,
+            "hits": self.hits,
+            "last_build_ms": round(self.last_build_ms, 3),
+        }
+
+
+def derived_view(
+    name: str, *, daily: bool = False, eager: bool = False, size: Callable[[Any], int] = len
+) -> Callable[[Callable[[JobSnapshot], T]], DerivedView[T]]:
+    """Decorator: register build(snapshot) as a DerivedView; call view.get(snapshot)."""
+
+    def register(build: Callable[[JobSnapshot], T]) -> DerivedView[T]:
+        return DerivedView(name, build, daily=daily, eager=eager, size=size)
+
+    return register
+
+
+def prebuild_derived_views(snapshot: JobSnapshot) -> None:
+    """Build every eager view for a just-published snapshot (writer side)."""
+    for view in list(_REGISTRY.values()):
+        if view.eager:
+            try:
+                view.get(snapshot)
+            except Exception as e:
+                print(f"❌ [Error] Failed to build {view.name}: {e}")
+
+
+def derived_view_stats() -> list[dict[str, Any]]:
+    """One stats() row per registered view (diagnostics)."""
+    return [view.stats() for view in _REGISTRY.values()]
@@ -0,0 +1,44 @@
+"""Background polling for data files (keeps stat() calls off the request path)."""
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+
+class PollingWatcher:
+    """Daemon thread that calls `check` every `interval` seconds until stopped.
+
+    `check` does its own stat()/reload work; exceptions are printed and polling
+    continues.
+    """
+
+    def __init__(self, name: str, check: Callable[[], None], interval: float):
+        self.name = name
+        self.check = check
+        self.interval = max(interval, 0.05)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"❌ [Error] {self.name} check failed: {e}")
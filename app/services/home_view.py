@@ -0,0 +1,45 @@
+"""Home page view model, built once per (job snapshot version, calendar day)."""
+from __future__ import annotations
+
+from typing import Any
+
+from app.config import CAREER_CATEGORIES
+from app.content_new import enrich_items, new_content_cutoff
+from app.services.derived_views import derived_view
+from app.services.job_snapshot import JobSnapshot
+
+
+def build_home_view(snapshot: JobSnapshot, cutoff: str) -> dict[str, Any]:
+    grouped_items = []
+    for cat in CAREER_CATEGORIES:
+        # Already newest-first in the snapshot; enrich_items wraps records, no copies.
+        items = enrich_items(list(snapshot.in_category(cat["slug"])), cutoff=cutoff)
+        if items:
+            cat_copy = cat.copy()
+            cat_copy["job_items"] = items
+            grouped_items.append(cat_copy)
+    return {
+        "grouped_items": grouped_items,
+        "total_count": snapshot.total_count,
+        "last_updated": snapshot.last_updated,
+        "featured_jobs": enrich_items(list(snapshot.featured), cutoff=cutoff),
+        "img_urls": snapshot.img_urls,
+    }
+
+
+@derived_view(
+    "home",
+    daily=True,
+    size=lambda view: sum(len(cat["job_items"]) for cat in view["grouped_items"]),
+)
+def _home_view(snapshot: JobSnapshot) -> dict[str, Any]:
+    return build_home_view(snapshot, new_content_cutoff())
+
+
+def home_view_model(snapshot: JobSnapshot) -> dict[str, Any]:
+    """index.html context shared by all requests until the data or the day changes.
+
+    The NEW badge cutoff is evaluated once per build. Treat the result as
+    read-only; pass a copy to TemplateResponse (it adds "request").
+    """
+    return _home_view.get(snapshot)
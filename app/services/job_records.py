@@ -0,0 +1,199 @@
+"""Compact read-only job records for JobSnapshot (no app imports; scripts load it)."""
+from __future__ import annotations
+
+import re
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+# job_data.json fields written by scripts/build_data.py
+JOB_FIELDS: tuple[str, ...] = (
+    "id",
+    "title",
+    "category",
+    "meta_description",
+    "tags",
+    "published",
+    "link",
+)
+_FIELD_SET = frozenset(JOB_FIELDS)
+# Values repeated across many jobs; interned so the catalogue holds one copy each.
+_INTERNED_FIELDS = frozenset({"category", "published"})
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class JobRecord(Mapping):
+    """One job_data.json entry stored in slots instead of a per-job dict.
+
+    Reads like the dict it came from: job["id"], job.get("tags"), `item.title` in
+    Jinja; absent keys stay absent (KeyError / Jinja Undefined). Tags become a
+    tuple; category, published and tags are interned; unknown keys go to _extra.
+    Immutable, so one record is shared by every request and derived view.
+    """
+
+    __slots__ = (*JOB_FIELDS, "_extra")
+
+    def __init__(self, raw: Mapping[str, Any]):
+        init = object.__setattr__
+        extra: dict[str, Any] | None = None
+        for key, value in raw.items():
+            if key == "tags" and isinstance(value, (list, tuple)):
+                value = tuple(_intern(t) for t in value)
+            elif key in _INTERNED_FIELDS:
+                value = _intern(value)
+            if key in _FIELD_SET:
+                init(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        init(self, "_extra", extra)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("JobRecord is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("JobRecord is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in JOB_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"JobRecord({dict(self)!r})"
+
+    def with_badge(self, published: str | None, is_new: bool) -> "BadgedJob":
+        """content_new.enrich_item result as a view (no per-request copy)."""
+        return badged_job(self, published, is_new)
+
+
+class BadgedJob(Mapping):
+    """A JobRecord with content_new's normalized `published` and `is_new` on top.
+
+    published=None keeps the record's own value (as enrich_item does). Built by
+    JobRecord.with_badge().
+    """
+
+    __slots__ = ("_job", "published", "is_new")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names not in our own slots (or an unset `published`).
+        if name == "_job":
+            raise AttributeError(name)
+        return getattr(self._job, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("BadgedJob is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "is_new":
+            return self.is_new
+        if key == "published" and self._own_published():
+            return self.published
+        return self._job[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def _own_published(self) -> bool:
+        try:
+            object.__getattribute__(self, "published")
+        except AttributeError:
+            return False
+        return True
+
+    def __contains__(self, key: object) -> bool:
+        if key == "is_new":
+            return True
+        if key == "published" and self._own_published():
+            return True
+        return key in self._job
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (k for k in self._job if k != "is_new")
+        if "published" not in self._job and self._own_published():
+            yield "published"
+        yield "is_new"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+# Slot setters bypass the read-only __setattr__ and an __init__ frame (one view per
+# card on the home page, so construction cost matters).
+_set_job = BadgedJob._job.__set__  # type: ignore[attr-defined]
+_set_published = BadgedJob.published.__set__  # type: ignore[attr-defined]
+_set_is_new = BadgedJob.is_new.__set__  # type: ignore[attr-defined]
+
+
+def badged_job(job: JobRecord, published: str | None, is_new: bool) -> BadgedJob:
+    """BadgedJob over any JobRecord-like mapping (see JobRecord.with_badge)."""
+    view = object.__new__(BadgedJob)
+    _set_job(view, job)
+    if published is not None:
+        _set_published(view, published)
+    _set_is_new(view, is_new)
+    return view
+
+
+def normalize_slug(slug: str) -> str:
+    """Career / image stem: lowercase snake_case only."""
+    s = (slug or "").strip().lower().replace("-", "_")
+    s = re.sub(r"[^a-z0-9_]", "", s)
+    s = re.sub(r"_+", "_", s).strip("_")
+    return s
+
+
+def career_id_for(filename: str, meta: Mapping[str, Any]) -> str:
+    """Job id of a contents/*.md file: frontmatter slug, else the file stem."""
+    stem = filename[:-3] if filename.endswith(".md") else filename
+    return normalize_slug(meta.get("slug") or stem)
+
+
+def job_from_meta(job_id: str, meta: Mapping[str, Any], published: str) -> dict[str, Any]:
+    """job_data.json entry for one career Markdown frontmatter (build_data, hot reload)."""
+    return {
+        "id": job_id,
+        "title": meta.get("title", "No Title"),
+        "category": meta.get("category", "engineering"),
+        "meta_description": meta.get("meta_description", "")[:160],
+        "tags": meta.get("tags", []),
+        "published": published,
+        "link": f"/career/{job_id}",
+    }
+
+
+def as_job_record(job: Mapping[str, Any]) -> JobRecord:
+    return job if isinstance(job, JobRecord) else JobRecord(job)
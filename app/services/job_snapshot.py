@@ -0,0 +1,248 @@
+"""Immutable, indexed view of job_data.json (one instance per reload)."""
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, replace
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping
+
+from app.config import GCS_IMG_BASE
+from app.seo_helpers import CAREER_SLUG_ALIASES, featured_jobs_from_data
+from app.services.job_records import JobRecord, as_job_record
+
+_EMPTY: tuple = ()
+_versions = itertools.count(1)
+
+
+def _published(job: Mapping[str, Any]) -> str:
+    """Sort key date, as content_new.enrich_item normalizes it."""
+    return str(job.get("published") or job.get("date") or "")[:10]
+
+
+def _newest_first(job: Mapping[str, Any]) -> tuple[str, str]:
+    # reverse=True key; build_data.py writes job_data.json in this order
+    return _published(job), job.get("id", "")
+
+
+def _category_key(job: Mapping[str, Any]) -> str:
+    return str(job.get("category", "")).lower()
+
+
+def _tag_keys(job: Mapping[str, Any]) -> Iterable[str]:
+    return (tag for tag in dict.fromkeys(str(t).strip() for t in job.get("tags") or ()) if tag)
+
+
+def career_thumb_url(slug: str, published: Any = "") -> str:
+    """Card thumbnail on GCS, `?v=<published date>` when the job has one."""
+    base = f"{GCS_IMG_BASE}/{slug}.png"
+    v = str(published or "").strip()[:10]
+    if len(v) >= 8:
+        return f"{base}?v={v}"
+    return base
+
+
+class CareerImgUrls(Mapping):
+    """slug → thumbnail URL for one snapshot; unknown slugs get the unversioned URL.
+
+    Card grids get it as `img_urls` in their context and index it per card.
+    """
+
+    __slots__ = ("_urls",)
+
+    def __init__(self, urls: dict[str, str]):
+        self._urls = urls
+
+    def __getitem__(self, slug: str) -> str:
+        url = self._urls.get(slug)
+        return url if url is not None else career_thumb_url(slug)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._urls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    """Job list plus lookup indexes, built once and never mutated.
+
+    Index values are tuples and read-only mappings over the same immutable
+    JobRecords, so indexes cost one pointer per entry.
+    """
+
+    version: int
+    # When the data last changed (ETags): job_data.json mtime or a content hot reload
+    mtime: float
+    data: Mapping[str, Any]
+    jobs: tuple[JobRecord, ...]
+    by_id: Mapping[str, JobRecord]
+    by_category: Mapping[str, tuple[JobRecord, ...]]
+    featured: tuple[JobRecord, ...]
+    aliases: Mapping[str, str]
+    by_tag: Mapping[str, tuple[JobRecord, ...]]
+    img_urls: CareerImgUrls
+    # Shared snapshot file generation (app.services.shared_snapshot); 0 = loaded locally.
+    generation: int = 0
+    # mtime of the job_data.json this was built from (reload checks compare it)
+    data_mtime: float = 0.0
+    # (version it was derived from, ids replaced or removed) for update_job_snapshot
+    # results, so derived values can be patched instead of rebuilt.
+    changed: tuple[int, frozenset[str]] | None = None
+
+    @property
+    def total_count(self) -> int:
+        return self.data.get("total_count", 0)
+
+    @property
+    def last_updated(self) -> str:
+        return self.data.get("last_updated", date.today().isoformat())
+
+    def get(self, job_id: str) -> JobRecord | None:
+        return self.by_id.get(job_id)
+
+    def img_url(self, slug: str) -> str:
+        return self.img_urls[slug]
+
+    def resolve(self, item_id: str) -> str:
+        """Canonical career id for a legacy/alias slug (seo_helpers.resolve_career_id)."""
+        return self.aliases.get((item_id or "").strip().lower(), item_id)
+
+    def in_category(self, slug: str) -> tuple[JobRecord, ...]:
+        """Jobs in a category (case-insensitive), newest published first."""
+        return self.by_category.get(slug.lower(), _EMPTY)
+
+    def tagged(self, tag: str) -> tuple[JobRecord, ...]:
+        return self.by_tag.get(tag.strip(), _EMPTY)
+
+    def lookup(self, ids: Iterable[str]) -> list[JobRecord]:
+        """Jobs for ids in the given order, skipping unknown ids."""
+        by_id = self.by_id
+        return [by_id[i] for i in ids if i in by_id]
+
+
+def build_job_snapshot(
+    data: Mapping[str, Any], mtime: float = 0.0, generation: int = 0
+) -> JobSnapshot:
+    jobs = tuple(as_job_record(j) for j in data.get("jobs") or ())
+    by_id: dict[str, JobRecord] = {}
+    by_category: dict[str, list[JobRecord]] = {}
+    by_tag: dict[str, list[JobRecord]] = {}
+    for job in jobs:
+        jid = job.get("id")
+        if jid:
+            by_id[jid] = job
+        by_category.setdefault(_category_key(job), []).append(job)
+        for tag in _tag_keys(job):
+            by_tag.setdefault(tag, []).append(job)
+    for items in by_category.values():
+        items.sort(key=_newest_first, reverse=True)
+
+    meta = {k: v for k, v in data.items() if k != "jobs"}
+    return JobSnapshot(
+        version=next(_versions),
+        mtime=mtime,
+        data=MappingProxyType(meta),
+        jobs=jobs,
+        by_id=MappingProxyType(by_id),
+        by_category=MappingProxyType({k: tuple(v) for k, v in by_category.items()}),
+        featured=tuple(featured_jobs_from_data(list(jobs))),
+        aliases=MappingProxyType(dict(CAREER_SLUG_ALIASES)),
+        by_tag=MappingProxyType({k: tuple(v) for k, v in by_tag.items()}),
+        img_urls=CareerImgUrls(
+            {jid: career_thumb_url(jid, job.get("published")) for jid, job in by_id.items()}
+        ),
+        generation=generation,
+        data_mtime=mtime,
+    )
+
+
+def _reindex(
+    index: Mapping[str, tuple[JobRecord, ...]],
+    keys: set[str],
+    touched: set[str],
+    added: dict[str, list[JobRecord]],
+) -> Mapping[str, tuple[JobRecord, ...]]:
+    """Copy of index with only `keys` rebuilt: touched ids dropped, `added` merged in."""
+    out = dict(index)
+    for key in keys:
+        items = [j for j in index.get(key, _EMPTY) if j.get("id") not in touched]
+        items += added.get(key, [])
+        items.sort(key=_newest_first, reverse=True)
+        if items:
+            out[key] = tuple(items)
+        else:
+            out.pop(key, None)
+    return MappingProxyType(out)
+
+
+def update_job_snapshot(
+    snapshot: JobSnapshot,
+    upserts: Iterable[Mapping[str, Any]] = (),
+    removed: Iterable[str] = (),
+    mtime: float | None = None,
+) -> JobSnapshot:
+    """New snapshot with jobs replaced/added by id and `removed` ids dropped.
+
+    Only the categories and tags of touched jobs are re-indexed; every other index
+    entry and record is shared with `snapshot`. Used by content hot reload
+    (app.services.content_watch); `mtime` defaults to the old snapshot's and
+    data_mtime is kept, so a newer job_data.json still replaces the result.
+    Upserts equal to the current record and unknown removals are no-ops; with
+    nothing left, `snapshot` itself is returned (same version and ETags).
+    """
+    by_id_before = snapshot.by_id
+    records = {
+        r["id"]: r
+        for r in map(as_job_record, upserts)
+        if r.get("id") and by_id_before.get(r["id"]) != r
+    }
+    touched = set(records) | {jid for jid in removed if jid in by_id_before}
+    if not touched:
+        return snapshot
+    before = [snapshot.by_id[i] for i in touched if i in snapshot.by_id]
+
+    jobs = [j for j in snapshot.jobs if j.get("id") not in touched]
+    jobs += records.values()
+    jobs.sort(key=_newest_first, reverse=True)  # near-sorted: linear for Timsort
+
+    by_id = dict(snapshot.by_id)
+    urls = dict(snapshot.img_urls._urls)
+    for jid in touched:
+        by_id.pop(jid, None)
+        urls.pop(jid, None)
+    by_id.update(records)
+    urls.update((jid, career_thumb_url(jid, job.get("published"))) for jid, job in records.items())
+
+    new_by_category: dict[str, list[JobRecord]] = {}
+    new_by_tag: dict[str, list[JobRecord]] = {}
+    for job in records.values():
+        new_by_category.setdefault(_category_key(job), []).append(job)
+        for tag in _tag_keys(job):
+            new_by_tag.setdefault(tag, []).append(job)
+    categories = {_category_key(j) for j in before} | set(new_by_category)
+    tags = {t for j in before for t in _tag_keys(j)} | set(new_by_tag)
+
+    meta = dict(snapshot.data)
+    if "total_count" in meta:
+        meta["total_count"] = len(jobs)
+    return replace(
+        snapshot,
+        version=next(_versions),
+        mtime=snapshot.mtime if mtime is None else max(mtime, snapshot.mtime),
+        data=MappingProxyType(meta),
+        jobs=tuple(jobs),
+        by_id=MappingProxyType(by_id),
+        by_category=_reindex(snapshot.by_category, categories, touched, new_by_category),
+        featured=tuple(featured_jobs_from_data(jobs)),
+        by_tag=_reindex(snapshot.by_tag, tags, touched, new_by_tag),
+        img_urls=CareerImgUrls(urls),
+        changed=(snapshot.version, frozenset(touched)),
+    )
+
+
+EMPTY_SNAPSHOT = build_job_snapshot({"jobs": [], "total_count": 0})
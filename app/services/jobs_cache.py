@@ -1,65 +1,205 @@
-"""Job data JSON cache (mtime-based reload)."""
+"""Job data JSON cache (mtime-based reload, atomic snapshot swap)."""
 from __future__ import annotations
 
-import json
 import os
-from datetime import date
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
 
-from app.config import DATA_FILE
+from app.config import DATA_FILE, JOBS_CHECK_INTERVAL, SHARED_SNAPSHOT_FILE
+from app.services.derived_views import prebuild_derived_views
+from app.services.file_watch import PollingWatcher
+from app.services.job_snapshot import (
+    EMPTY_SNAPSHOT,
+    JobSnapshot,
+    build_job_snapshot,
+    update_job_snapshot,
+)
+from app.services.shared_snapshot import (
+    attach_shared_snapshot,
+    shared_snapshot_generation,
+    shared_snapshot_supported,
+)
+from app.utils import json_codec
 
-JOB_DATA: dict = {
-    "jobs": [],
-    "last_updated": date.today().isoformat(),
-    "total_count": 0,
-}
-_JOB_CACHE_MTIME: float = 0.0
+# Reloads build a new JobSnapshot off to the side and publish it with one reference
+# assignment, so readers never see a half-loaded job list and never take a lock.
+_SNAPSHOT: JobSnapshot = EMPTY_SNAPSHOT
+# Last replaced snapshot; requests that captured it keep rendering from it.
+_PREVIOUS_SNAPSHOT: JobSnapshot | None = None
+# Serializes writers only (parse + build + publish).
+_RELOAD_LOCK = threading.Lock()
+# time.monotonic() of the last request-path mtime check (see ensure_jobs_cache)
+_LAST_CHECK: float = 0.0
+_WATCHER: PollingWatcher | None = None
 
 
-def _set_job_data(data: dict) -> None:
-    """Update JOB_DATA in place so all importers keep the same object reference."""
-    JOB_DATA.clear()
-    JOB_DATA.update(data)
+class _JobDataView(Mapping):
+    """Read-only dict view of the current snapshot for legacy JOB_DATA importers.
+
+    Each lookup reads whichever snapshot is current; capture current_snapshot()
+    once instead when several values must agree.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        snapshot = _SNAPSHOT
+        if key == "jobs":
+            return snapshot.jobs
+        return snapshot.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("jobs", *_SNAPSHOT.data))
+
+    def __len__(self) -> int:
+        return 1 + len(_SNAPSHOT.data)
+
+
+JOB_DATA: Mapping[str, Any] = _JobDataView()
+
+
+def _publish(snapshot: JobSnapshot) -> None:
+    global _SNAPSHOT, _PREVIOUS_SNAPSHOT
+    _PREVIOUS_SNAPSHOT = _SNAPSHOT
+    _SNAPSHOT = snapshot
+
+
+def _prebuild(snapshot: JobSnapshot) -> None:
+    # After _RELOAD_LOCK is released; if a newer snapshot was published meanwhile,
+    # its writer builds for that one instead.
+    if snapshot is _SNAPSHOT:
+        prebuild_derived_views(snapshot)
+
+
+def _load_snapshot(mtime: float) -> JobSnapshot:
+    if SHARED_SNAPSHOT_FILE and shared_snapshot_supported():
+        store = attach_shared_snapshot(DATA_FILE, SHARED_SNAPSHOT_FILE, mtime)
+        data = {**store.meta, "jobs": store.records()}
+        return build_job_snapshot(data, store.source_mtime, store.generation)
+    return build_job_snapshot(json_codec.load_file(DATA_FILE), mtime)
+
+
+def _shared_generation_changed() -> bool:
+    """Whether another worker rewrote the shared snapshot file since our last load."""
+    if not (SHARED_SNAPSHOT_FILE and shared_snapshot_supported()):
+        return False
+    generation = shared_snapshot_generation(SHARED_SNAPSHOT_FILE)
+    return generation is not None and generation != _SNAPSHOT.generation
+
+
+def current_snapshot() -> JobSnapshot:
+    """The JobSnapshot of the last successful load (replaced on reload, never mutated)."""
+    return _SNAPSHOT
+
+
+def previous_snapshot() -> JobSnapshot | None:
+    return _PREVIOUS_SNAPSHOT
 
 
 def ensure_jobs_cache() -> None:
-    global _JOB_CACHE_MTIME
-    if not os.path.exists(DATA_FILE):
+    """Reload job_data.json if it changed, checking at most every JOBS_CHECK_INTERVAL s.
+
+    With the watcher running this is a no-op: the watcher thread does the checks.
+    """
+    global _LAST_CHECK
+    if _WATCHER is not None:
+        return
+    now = time.monotonic()
+    # Before the first successful load (mtime 0.0) always check.
+    if _SNAPSHOT.data_mtime and now - _LAST_CHECK < JOBS_CHECK_INTERVAL:
         return
+    _LAST_CHECK = now
+    reload_jobs_if_changed()
+
+
+def jobs_check_due() -> bool:
+    """Whether ensure_jobs_cache() would check job_data.json now (cheap, no I/O)."""
+    if _WATCHER is not None:
+        return False
+    return not _SNAPSHOT.data_mtime or time.monotonic() - _LAST_CHECK >= JOBS_CHECK_INTERVAL
+
+
+def reload_jobs_if_changed() -> None:
     try:
-        mtime = os.path.getmtime(DATA_FILE)
+        mtime = os.stat(DATA_FILE).st_mtime
     except OSError:
         return
-    if mtime <= _JOB_CACHE_MTIME:
+    if mtime <= _SNAPSHOT.data_mtime and not _shared_generation_changed():
         return
-    try:
-        with open(DATA_FILE, encoding="utf-8") as f:
-            _set_job_data(json.load(f))
-        _JOB_CACHE_MTIME = mtime
-    except Exception as e:
-        print(f"❌ [Error] Failed to reload job JSON: {e}")
+    with _RELOAD_LOCK:
+        # another thread reloaded while we waited
+        if mtime <= _SNAPSHOT.data_mtime and not _shared_generation_changed():
+            return
+        try:
+            snapshot = _load_snapshot(mtime)
+        except Exception as e:
+            print(f"❌ [Error] Failed to reload job JSON: {e}")
+            return
+        _publish(snapshot)
+    _prebuild(snapshot)
+
+
+def apply_job_updates(
+    upserts: Iterable[Mapping[str, Any]], removed: Iterable[str], mtime: float
+) -> JobSnapshot:
+    """Publish the current snapshot with some jobs replaced/removed (content hot reload).
+
+    A later job_data.json reload replaces the result wholesale.
+    """
+    with _RELOAD_LOCK:
+        previous = _SNAPSHOT
+        snapshot = update_job_snapshot(previous, upserts, removed, mtime)
+        if snapshot is not previous:
+            _publish(snapshot)
+    if snapshot is not previous:
+        _prebuild(snapshot)
+    return snapshot
 
 
 def load_jobs_on_startup() -> None:
-    global _JOB_CACHE_MTIME
     if os.path.exists(DATA_FILE):
         try:
-            with open(DATA_FILE, encoding="utf-8") as f:
-                _set_job_data(json.load(f))
-            _JOB_CACHE_MTIME = os.path.getmtime(DATA_FILE)
-            print(f"✅ [Success] Loaded {JOB_DATA.get('total_count', 0)} jobs.")
+            with _RELOAD_LOCK:
+                snapshot = _load_snapshot(os.path.getmtime(DATA_FILE))
+                _publish(snapshot)
+            _prebuild(snapshot)
+            print(f"✅ [Success] Loaded {_SNAPSHOT.total_count} jobs.")
         except Exception as e:
             print(f"❌ [Error] Failed to load JSON: {e}")
 
 
-def related_careers_from_meta(meta: dict) -> list[dict]:
+def start_jobs_watcher(interval: float | None = None) -> None:
+    """Poll job_data.json in a daemon thread (STARFUL_JOBS_WATCH=1)."""
+    global _WATCHER
+    if _WATCHER is None:
+        _WATCHER = PollingWatcher(
+            "jobs-watcher", reload_jobs_if_changed, interval or JOBS_CHECK_INTERVAL or 1.0
+        )
+        _WATCHER.start()
+
+
+def stop_jobs_watcher() -> None:
+    global _WATCHER
+    if _WATCHER is not None:
+        _WATCHER.stop()
+        _WATCHER = None
+
+
+def jobs_data_mtime() -> float:
+    """When the job data last changed (job_data.json mtime or a content hot reload;
+    0.0 before the first load); used in ETags."""
+    return _SNAPSHOT.mtime
+
+
+def related_careers_from_meta(meta: dict, snapshot: JobSnapshot | None = None) -> list[dict]:
     """Resolve related_jobs IDs from job_data with titles."""
     ids = meta.get("related_jobs") or []
     if not ids:
         return []
-    by_id = {j.get("id"): j for j in JOB_DATA.get("jobs", []) if j.get("id")}
+    snapshot = snapshot or current_snapshot()
     out: list[dict] = []
     for rid in ids:
-        job = by_id.get(rid)
+        job = snapshot.get(rid)
         if job:
             out.append({"id": rid, "title": job.get("title", rid)})
     return out
@@ -1,13 +1,14 @@
 """MBTI type → IT career mapping helpers."""
 from __future__ import annotations
 
-import json
 import os
 from functools import lru_cache
 from typing import Any
 
 from app.config import STATIC_DIR
-from app.services.jobs_cache import JOB_DATA, ensure_jobs_cache
+from app.services.job_snapshot import JobSnapshot
+from app.services.jobs_cache import current_snapshot, ensure_jobs_cache
+from app.utils import json_codec
 
 MBTI_DATA_FILE = os.path.join(STATIC_DIR, "json", "mbti_careers.json")
 MBTI_TYPE_ORDER: tuple[str, ...] = (
@@ -33,8 +34,16 @@ VALID_TYPES = frozenset(MBTI_TYPE_ORDER)
 
 @lru_cache(maxsize=1)
 def _load_raw() -> dict[str, Any]:
-    with open(MBTI_DATA_FILE, encoding="utf-8") as f:
-        return json.load(f)
+    return json_codec.load_file(MBTI_DATA_FILE)
+
+
+@lru_cache(maxsize=1)
+def mbti_data_mtime() -> float:
+    """mtime of mbti_careers.json as loaded by _load_raw (cached for the process)."""
+    try:
+        return os.path.getmtime(MBTI_DATA_FILE)
+    except OSError:
+        return 0.0
 
 
 def normalize_mbti_type(raw: str) -> str | None:
@@ -58,8 +67,8 @@ def list_mbti_types() -> list[dict[str, Any]]:
     return items
 
 
-def get_mbti_type(code: str) -> dict[str, Any] | None:
-    """Hydrated type payload with career links from JOB_DATA."""
+def get_mbti_type(code: str, snapshot: JobSnapshot | None = None) -> dict[str, Any] | None:
+    """Hydrated type payload with career links from the job snapshot."""
     normalized = normalize_mbti_type(code)
     if not normalized:
         return None
@@ -69,11 +78,11 @@ def get_mbti_type(code: str) -> dict[str, Any] | None:
     if not entry:
         return None
 
-    jobs_by_id = {j.get("id"): j for j in JOB_DATA.get("jobs", []) if j.get("id")}
+    snapshot = snapshot or current_snapshot()
     careers = []
     for c in entry.get("careers") or []:
         jid = c.get("id", "")
-        job = jobs_by_id.get(jid)
+        job = snapshot.get(jid)
         if not job:
             continue
         careers.append(
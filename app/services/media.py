@@ -14,22 +14,13 @@ from app.config import (
     LOCAL_IMG_NAMES,
     STATIC_DIR,
 )
-from app.services.jobs_cache import JOB_DATA, ensure_jobs_cache
+from app.services.jobs_cache import current_snapshot, ensure_jobs_cache
 
 
 def career_img_url(slug: str) -> str:
     """커리어 카드 썸네일 — GCS 직접 참조 (okadmin 업로드 즉시 반영)."""
     ensure_jobs_cache()
-    published = ""
-    for job in JOB_DATA.get("jobs", []):
-        if job.get("id") == slug:
-            published = str(job.get("published") or "")
-            break
-    base = f"{GCS_IMG_BASE}/{slug}.png"
-    v = str(published).strip()[:10]
-    if len(v) >= 8:
-        return f"{base}?v={v}"
-    return base
+    return current_snapshot().img_url(slug)
 
 
 def gcs_or_static_img(filename: str, cache_v: str | None = None) -> str:
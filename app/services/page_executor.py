@@ -0,0 +1,121 @@
+"""Dedicated thread pool for CPU/disk-bound page work (Markdown, templates, file I/O).
+
+Keeps expensive renders off the event loop and out of Starlette's shared threadpool,
+so cheap routes (e.g. /api/reactions/{slug}) are not queued behind them.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from fastapi import HTTPException
+
+from app.config import PAGE_QUEUE_LIMIT, PAGE_WORKERS
+
+T = TypeVar("T")
+
+
+class PageExecutor:
+    def __init__(self, max_workers: int = PAGE_WORKERS, queue_limit: int = PAGE_QUEUE_LIMIT):
+        self.max_workers = max(1, max_workers)
+        self.queue_limit = max(0, queue_limit)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="starful-page"
+                    )
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool; 503 when queue_limit tasks are already waiting."""
+        with self._lock:
+            if self.queue_limit and self.queued >= self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(status_code=503, headers={"Retry-After": "1"})
+            self.queued += 1
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        enqueued_at = time.perf_counter()
+        dequeued = False
+
+        def leave_queue() -> None:
+            nonlocal dequeued
+            if not dequeued:
+                dequeued = True
+                self.queued -= 1
+
+        def task() -> T:
+            with self._lock:
+                leave_queue()
+                self.running += 1
+                self.wait_seconds += time.perf_counter() - enqueued_at
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), task)
+        finally:
+            # Cancelled before a worker picked it up (client went away).
+            with self._lock:
+                leave_queue()
+
+    async def iterate(self, chunks: Iterator[T]) -> AsyncIterator[T]:
+        """Pull each item of a blocking iterator on the pool (streamed responses).
+
+        Not subject to queue_limit: the request was already admitted by run().
+        """
+        loop = asyncio.get_running_loop()
+        done = object()
+        while True:
+            item = await loop.run_in_executor(self._executor(), next, chunks, done)
+            if item is done:
+                return
+            yield item
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "queued": self.queued,
+                "running": self.running,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.wait_seconds * 1000 / started, 3) if started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+page_executor = PageExecutor()
+
+
+async def run_page_work(fn: Callable[..., T], *args: Any) -> T:
+    return await page_executor.run(fn, *args)
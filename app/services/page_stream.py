@@ -0,0 +1,69 @@
+"""Streamed template responses (Jinja generate) that fill the page store when complete."""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.services.compression import page_store
+from app.services.page_executor import page_executor
+from app.templating import templates
+
+# The first chunk goes out as soon as it holds <head> and the critical CSS; later
+# chunks are larger to keep per-chunk pool hand-offs few.
+FIRST_CHUNK_BYTES = 4 * 1024
+STREAM_CHUNK_BYTES = 32 * 1024
+HTML_MEDIA_TYPE = "text/html"
+
+
+def template_chunks(request: Request, name: str, context: dict[str, Any]) -> Iterator[bytes]:
+    """detail.html etc. as UTF-8 chunks, rendered lazily by Jinja's generate()."""
+    context.setdefault("request", request)
+    for context_processor in templates.context_processors:
+        context.update(context_processor(request))
+    template = templates.get_template(name)
+    parts: list[str] = []
+    size = 0
+    limit = FIRST_CHUNK_BYTES
+    for piece in template.generate(context):
+        parts.append(piece)
+        size += len(piece)
+        if size >= limit:
+            yield "".join(parts).encode("utf-8")
+            parts, size, limit = [], 0, STREAM_CHUNK_BYTES
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _store_when_complete(chunks: Iterator[bytes], etag: str) -> Iterator[bytes]:
+    body: list[bytes] = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    # Still on the pool (last next() call); compresses for later hits.
+    page_store.put(etag, b"".join(body), HTML_MEDIA_TYPE)
+
+
+def streamed_page(
+    request: Request,
+    etag: str,
+    headers: dict[str, str],
+    template: Callable[[], tuple[str, dict[str, Any]]],
+) -> Response:
+    """Like cached_page, but a miss streams the template instead of rendering it first.
+
+    template() returns (name, context) and may raise HTTPException before anything is
+    sent. The streamed copy is identity-encoded; once complete it is stored, so later
+    requests get the precompressed variants.
+    """
+    variants = page_store.get(etag)
+    if variants is not None:
+        return variants.response(request, headers)
+    name, context = template()
+    out_headers = dict(headers)
+    out_headers["Vary"] = "Accept-Encoding"
+    chunks = _store_when_complete(template_chunks(request, name, context), etag)
+    return StreamingResponse(
+        page_executor.iterate(chunks), media_type=HTML_MEDIA_TYPE, headers=out_headers
+    )
@@ -0,0 +1,28 @@
+"""ETag / Last-Modified inputs for server-rendered pages."""
+from __future__ import annotations
+
+from datetime import date, datetime, time
+
+from app.config import APP_REVISION
+from app.templating import TEMPLATE_MTIME, TEMPLATE_VERSION
+from app.utils.http import make_etag
+
+
+def page_validators(
+    kind: str,
+    *parts: object,
+    mtimes: tuple[float, ...] = (),
+    daily: bool = False,
+) -> tuple[str, float]:
+    """(etag, last_modified) for a page built from templates plus the given inputs.
+
+    daily=True for pages whose output depends on today's date (NEW badges, sitemap
+    lastmod): the ETag rolls over and Last-Modified is at least local midnight.
+    """
+    stamps = [TEMPLATE_MTIME, *mtimes]
+    key: tuple[object, ...] = (kind, APP_REVISION, TEMPLATE_VERSION, *parts)
+    if daily:
+        today = date.today()
+        key += (today.isoformat(),)
+        stamps.append(datetime.combine(today, time()).timestamp())
+    return make_etag(*key), max(stamps)
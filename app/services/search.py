@@ -1,9 +1,47 @@
-"""Career search scoring and query expansion."""
+"""Career search scoring and query expansion.
+
+Versions and content hot reload (app.services.content_watch) — the rules that
+let /search keep cached results across a reload:
+
+- A body index version is (file mtime, patch generation). Loading a new
+  BODY_INDEX_FILE starts at generation 0; each BodyIndexFile.patch() adds one,
+  and _patches[g] holds the ids patched by generation g + 1. So
+  changed_between(old, new) is the union of _patches[old[1]:new[1]], or None
+  when the file was reloaded in between (or old is newer than new).
+- Patched guides are scored with the base file's idf and average length
+  (PatchedBodyIndex), and field scores are per job, so a reload never changes
+  the score of a guide it did not touch.
+- SearchResultCache is keyed by (query, snapshot version, body version). On a
+  new generation, advance() keeps an entry only if none of the changed ids
+  (JobSnapshot.changed plus changed_between) is in its results or would be
+  listed for its query now (still_valid); with the changed ids unknown it
+  clears. By the previous rule every kept entry equals a fresh search.
+- advance() never moves back to an older snapshot version, and put() drops
+  results computed for a generation other than the cache's, so a request still
+  holding an old snapshot or body cannot write stale entries.
+"""
 from __future__ import annotations
 
+import os
 import re
+import threading
 import unicodedata
-from typing import Set
+from collections import OrderedDict
+from typing import Any, Callable, Sequence, Set
+
+from app.config import BODY_INDEX_FILE, SEARCH_CACHE_SIZE
+from app.services.derived_views import derived_view
+from app.services.job_snapshot import JobSnapshot
+from app.services.text_index import BodyIndex, InvertedIndex, PatchedBodyIndex
+
+# (file mtime, patch generation) of BodyIndexFile.current()
+BodyVersion = tuple[float, int]
+
+# Added to the field score of a guide in proportion to its body relevance
+# (BodyIndex.scores, 0..1); guides matching only in the body need
+# BODY_MIN_RELEVANCE to be listed at all.
+BODY_SCORE_WEIGHT = 60
+BODY_MIN_RELEVANCE = 0.05
 
 SEARCH_SYNONYMS: dict[str, set[str]] = {
     "backend": {"backend", "バックエンド", "server", "api"},
@@ -43,12 +81,18 @@ def expand_query_terms(query: str) -> Set[str]:
     return terms
 
 
-def score_job_for_terms(job: dict, terms: Set[str]) -> int:
-    title = normalize_search_text(job.get("title", ""))
-    category = normalize_search_text(job.get("category", ""))
-    tags = " ".join(job.get("tags", []) or [])
-    tags_text = normalize_search_text(tags)
-    desc = normalize_search_text(job.get("meta_description", ""))
+def search_fields(job: dict) -> tuple[str, str, str, str]:
+    """Normalized (title, category, tags, meta_description) that scoring matches."""
+    return (
+        normalize_search_text(job.get("title", "")),
+        normalize_search_text(job.get("category", "")),
+        normalize_search_text(" ".join(job.get("tags", []) or [])),
+        normalize_search_text(job.get("meta_description", "")),
+    )
+
+
+def score_search_fields(fields: tuple[str, str, str, str], terms: Set[str]) -> int:
+    title, category, tags_text, desc = fields
 
     score = 0
     for term in terms:
@@ -72,6 +116,15 @@ def score_job_for_terms(job: dict, terms: Set[str]) -> int:
     return score
 
 
+def score_job_for_terms(job: dict, terms: Set[str]) -> int:
+    return score_search_fields(search_fields(job), terms)
+
+
+def _ranked(scored: list[tuple[int, dict]]) -> list[dict]:
+    scored.sort(key=lambda x: (-x[0], x[1].get("title", "")))
+    return [job for _, job in scored]
+
+
 def search_jobs(jobs: list[dict], query: str) -> list[dict]:
     terms = expand_query_terms(query)
     if not terms:
@@ -82,6 +135,339 @@ def search_jobs(jobs: list[dict], query: str) -> list[dict]:
         score = score_job_for_terms(job, terms)
         if score > 0:
             scored.append((score, job))
+    return _ranked(scored)
 
-    scored.sort(key=lambda x: (-x[0], x[1].get("title", "")))
-    return [job for _, job in scored]
+
+class SearchIndex:
+    """search_jobs over a fixed job list, scoring only jobs the index can match.
+
+    search_fields() are normalized once here, not per query. Every expanded term
+    is looked up in an InvertedIndex of those fields; the union of the candidates
+    is scored with score_search_fields in list order, so results are the same as
+    search_jobs(jobs, query).
+    """
+
+    def __init__(self, jobs: Sequence[dict]):
+        self.jobs = tuple(jobs)
+        self.fields = tuple(search_fields(job) for job in self.jobs)
+        self.index = InvertedIndex(self.fields)
+        self.positions = {job.get("id"): i for i, job in enumerate(self.jobs)}
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def updated(self, jobs: Sequence[dict], changed: Set[str]) -> "SearchIndex":
+        """Index of `jobs`, which differ from self.jobs only in the `changed` ids.
+
+        Other jobs keep their normalized fields and postings (renumbered to their
+        new position), so the cost follows the change, not the catalogue.
+        """
+        new = object.__new__(SearchIndex)
+        new.jobs = tuple(jobs)
+        positions = self.positions
+        remap: list[int | None] = [None] * len(self.jobs)
+        fields: list[tuple[str, str, str, str]] = []
+        added: list[int] = []
+        for i, job in enumerate(new.jobs):
+            job_id = job.get("id")
+            old = positions.get(job_id) if job_id and job_id not in changed else None
+            if old is None:
+                fields.append(search_fields(job))
+                added.append(i)
+            else:
+                fields.append(self.fields[old])
+                remap[old] = i
+        new.fields = tuple(fields)
+        new.index = self.index.updated(remap, ((i, fields[i]) for i in added), len(fields))
+        new.positions = {job.get("id"): i for i, job in enumerate(new.jobs)}
+        return new
+
+    def candidates(self, terms: Set[str]) -> list[int]:
+        ids: set[int] = set()
+        for term in terms:
+            found = self.index.candidates(term)
+            if found is None:
+                return list(range(len(self.jobs)))
+            ids |= found
+        return sorted(ids)
+
+    def lists_any(self, query: str, job_ids: Set[str], body: BodyIndex | PatchedBodyIndex | None) -> bool:
+        """Whether search(query, body) would list any of job_ids."""
+        positions = self.positions
+        present = [positions[j] for j in job_ids if j in positions]
+        if not present:
+            return False
+        terms = expand_query_terms(query)
+        if not terms:
+            return False
+        if any(score_search_fields(self.fields[i], terms) > 0 for i in present):
+            return True
+        if body is None:
+            return False
+        relevance = body.scores(query)
+        return any(relevance.get(j, 0.0) >= BODY_MIN_RELEVANCE for j in job_ids if j in positions)
+
+    def search(self, query: str, body: BodyIndex | PatchedBodyIndex | None = None) -> list[dict]:
+        """Ranked jobs; with a body index, guides whose text is relevant to the
+        query are boosted by up to BODY_SCORE_WEIGHT (and added if missing)."""
+        terms = expand_query_terms(query)
+        if not terms:
+            return []
+        fields = self.fields
+        scores: dict[int, float] = {}
+        for i in self.candidates(terms):
+            score = score_search_fields(fields[i], terms)
+            if score > 0:
+                scores[i] = score
+        if body is not None:
+            for job_id, relevance in body.scores(query).items():
+                i = self.positions.get(job_id)
+                if i is None or (i not in scores and relevance < BODY_MIN_RELEVANCE):
+                    continue
+                scores[i] = scores.get(i, 0) + BODY_SCORE_WEIGHT * relevance
+        jobs = self.jobs
+        return _ranked([(score, jobs[i]) for i, score in sorted(scores.items())])
+
+
+@derived_view("search_index")
+def snapshot_search_index(snapshot: JobSnapshot) -> SearchIndex:
+    return SearchIndex(snapshot.jobs)
+
+
+@snapshot_search_index.updater
+def _update_search_index(index: SearchIndex, snapshot: JobSnapshot) -> SearchIndex:
+    return index.updated(snapshot.jobs, snapshot.changed[1])
+
+
+class BodyIndexFile:
+    """BODY_INDEX_FILE mapped read-only; re-opened when build_data.py rewrites it.
+
+    Content hot reload patches edited guides in (patch()) until the next build.
+    """
+
+    def __init__(self, path: str = BODY_INDEX_FILE):
+        self.path = path
+        # (index, (file mtime, patch generation)); replaced whole so it stays consistent.
+        self._current: tuple[BodyIndex | PatchedBodyIndex | None, BodyVersion] | None = None
+        # ids patched by each generation since the file was loaded
+        self._patches: list[frozenset[str]] = []
+        self._lock = threading.Lock()
+
+    def current(self) -> tuple[BodyIndex | PatchedBodyIndex | None, BodyVersion]:
+        """(index or None, version); the version changes with the file or a patch."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = 0.0
+        current = self._current
+        if current is not None and current[1][0] == mtime:
+            return current
+        with self._lock:
+            if self._current is None or self._current[1][0] != mtime:
+                index = None
+                if mtime:
+                    try:
+                        index = BodyIndex(self.path)
+                    except Exception as e:
+                        print(f"❌ [Error] Failed to load body index: {e}")
+                # The replaced index unmaps itself (BodyIndex.__del__) once the
+                # requests still reading it are done.
+                self._current = (index, (mtime, 0))
+                self._patches = []
+            return self._current
+
+    def get(self) -> BodyIndex | PatchedBodyIndex | None:
+        """The current index, or None when the file is missing or unreadable."""
+        return self.current()[0]
+
+    def patch(self, texts: dict[str, str | None]) -> None:
+        """Replace guide texts (markdown_plain_text; None removes the guide)."""
+        self.current()
+        with self._lock:
+            index, (mtime, generation) = self._current  # type: ignore[misc]
+            if index is None or not texts:
+                return
+            self._current = (index.patched(texts), (mtime, generation + 1))
+            self._patches.append(frozenset(texts))
+
+    def changed_between(self, old: BodyVersion, new: BodyVersion) -> frozenset[str] | None:
+        """Guide ids patched from version old to new; None when the file changed
+        (see the module docstring)."""
+        if old[0] != new[0] or old[1] > new[1]:
+            return None
+        with self._lock:
+            if self._current is None or self._current[1][0] != new[0]:
+                return None
+            return frozenset().union(*self._patches[old[1] : new[1]])
+
+
+body_index_file = BodyIndexFile()
+
+
+# (normalized query, snapshot version, body index version)
+SearchKey = tuple[str, int, BodyVersion]
+
+
+class SearchResultCache:
+    """Bounded LRU of ranked /search results.
+
+    Keyed by (normalized query, snapshot version, body index version): every
+    input of SearchIndex.search, so a hit is always the list scoring would
+    produce. See the module docstring for how advance() carries entries over.
+    """
+
+    def __init__(self, maxsize: int = SEARCH_CACHE_SIZE):
+        self.maxsize = max(0, maxsize)
+        self._entries: OrderedDict[SearchKey, tuple[dict, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        # (snapshot version, body index version) of the cached entries
+        self.generation: tuple[int, BodyVersion] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.dropped = 0
+
+    def advance(
+        self,
+        generation: tuple[int, BodyVersion],
+        changed: frozenset[str] | None,
+        still_valid: Callable[[str, tuple[dict, ...]], bool],
+    ) -> None:
+        """Re-key entries to generation. changed: ids that differ from the current
+        generation (None: unknown, clear all); entries are kept if
+        still_valid(normalized query, results)."""
+        with self._lock:
+            if generation == self.generation:
+                return
+            # A request still holding the previous snapshot must not wipe the
+            # entries of the current one.
+            if self.generation is not None and generation[0] < self.generation[0]:
+                return
+            if changed is None:
+                if self._entries:
+                    self._entries.clear()
+                    self.invalidations += 1
+            else:
+                kept: OrderedDict[SearchKey, tuple[dict, ...]] = OrderedDict()
+                for (query, *_), results in self._entries.items():
+                    if still_valid(query, results):
+                        kept[(query, *generation)] = results
+                self.dropped += len(self._entries) - len(kept)
+                self._entries = kept
+            self.generation = generation
+
+    def get(self, key: SearchKey) -> tuple[dict, ...] | None:
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            self.misses += 1
+            return None
+
+    def put(self, key: SearchKey, results: tuple[dict, ...]) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            if key[1:] != self.generation:  # computed for another generation
+                return
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "dropped": self.dropped,
+            }
+
+
+search_cache = SearchResultCache()
+
+
+def current_body_index() -> tuple[BodyIndex | PatchedBodyIndex | None, BodyVersion]:
+    """body_index_file.current(), for one request's search_snapshot and body_snippets."""
+    return body_index_file.current()
+
+
+def search_snapshot(
+    snapshot: JobSnapshot,
+    query: str,
+    body_current: tuple[BodyIndex | PatchedBodyIndex | None, BodyVersion] | None = None,
+) -> tuple[dict, ...]:
+    """/search results for one snapshot (index built once per snapshot version),
+    including guides that only match in their body when the body index exists.
+
+    body_current: current_body_index() taken by the caller, so it can show
+    snippets from the same body version (body_snippets); read here if omitted.
+    Repeated queries are answered from search_cache without scoring; the result
+    is shared, so treat it as read-only.
+    """
+    body, body_version = body_current or body_index_file.current()
+    index = snapshot_search_index.get(snapshot)
+    generation = (snapshot.version, body_version)
+    if search_cache.generation != generation:
+        changed = _changed_since(search_cache.generation, snapshot, body_version)
+
+        def still_valid(q: str, results: tuple[dict, ...]) -> bool:
+            if any(job.get("id") in changed for job in results):  # type: ignore[operator]
+                return False
+            return not index.lists_any(q, changed, body)  # type: ignore[arg-type]
+
+        search_cache.advance(generation, changed, still_valid)
+    key = (normalize_search_text(query), *generation)
+    results = search_cache.get(key)
+    if results is None:
+        results = tuple(index.search(query, body))
+        search_cache.put(key, results)
+    return results
+
+
+def _changed_since(
+    previous: tuple[int, BodyVersion] | None, snapshot: JobSnapshot, body_version: BodyVersion
+) -> frozenset[str] | None:
+    """Job ids whose search inputs differ between previous and the given
+    generation, or None when that is not known (full reload, several steps)."""
+    if previous is None:
+        return None
+    version, previous_body = previous
+    if version == snapshot.version:
+        changed: frozenset[str] = frozenset()
+    elif snapshot.changed is not None and snapshot.changed[0] == version:
+        changed = snapshot.changed[1]
+    else:
+        return None
+    body_changed = body_index_file.changed_between(previous_body, body_version)
+    return None if body_changed is None else changed | body_changed
+
+
+def body_snippets(
+    job_ids: Sequence[str], query: str, body: BodyIndex | PatchedBodyIndex | None
+) -> dict[str, tuple[str, str, str]]:
+    """job id → (before, match, after) body excerpt for search_results.html, from
+    the body index the results were ranked with (search_snapshot's body_current)."""
+    if body is None or not query.strip():
+        return {}
+    out = {}
+    for job_id in job_ids:
+        snippet = body.snippet(job_id, query)
+        if snippet is not None:
+            out[job_id] = snippet
+    return out
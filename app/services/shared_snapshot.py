@@ -0,0 +1,213 @@
+"""Job snapshot file shared by the uvicorn workers on one host.
+
+With STARFUL_SHARED_SNAPSHOT=/dev/shm/starful_jobs.snap the first worker that
+sees a changed job_data.json parses it (under a host-wide flock) and writes the
+file; the other workers map it instead of parsing the JSON again. Each rewrite
+bumps a generation counter, and workers reload when it differs from their
+snapshot's (jobs_cache.reload_jobs_if_changed).
+
+Only the file is shared: the raw strings, each distinct value stored once per
+host. Every worker decodes each row once into its own JobRecords, and the
+snapshot indexes, search index and derived views are built per worker as usual.
+
+File layout (little-endian):
+  header   magic, format, generation, source mtime, job count, offsets
+  table    one row per job: (kind, offset, length) per JOB_FIELDS entry + extras
+  meta     JSON of the top-level non-job keys (total_count, last_updated, ...)
+  strings  UTF-8 values; identical values (categories, dates, tags) stored once
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Iterator, Mapping
+
+from app.services.job_records import JOB_FIELDS, JobRecord
+from app.utils import json_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows: no host-wide lock, shared snapshots unavailable
+    fcntl = None
+
+MAGIC = b"SFJS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sIQdIQQQQ")
+_CELL = struct.Struct("<BII")
+_COLUMNS = len(JOB_FIELDS) + 1  # + extras (JSON object of unknown keys)
+_ROW_SIZE = _CELL.size * _COLUMNS
+_EXTRAS = len(JOB_FIELDS)
+_FIELD_INDEX = {name: i for i, name in enumerate(JOB_FIELDS)}
+
+KIND_ABSENT, KIND_STR, KIND_TAGS, KIND_JSON = 0, 1, 2, 3
+_TAG_SEP = "\x1f"
+_ABSENT = object()
+
+
+def shared_snapshot_supported() -> bool:
+    return fcntl is not None
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.blob = bytearray()
+        self._seen: dict[bytes, int] = {}
+
+    def add(self, value: bytes) -> tuple[int, int]:
+        offset = self._seen.get(value)
+        if offset is None:
+            offset = self._seen[value] = len(self.blob)
+            self.blob += value
+        return offset, len(value)
+
+
+def _encode_cell(strings: _StringTable, key: str, value: Any) -> tuple[int, int, int]:
+    if isinstance(value, str):
+        return (KIND_STR, *strings.add(value.encode("utf-8")))
+    if (
+        key == "tags"
+        and isinstance(value, (list, tuple))
+        and all(isinstance(t, str) and _TAG_SEP not in t for t in value)
+    ):
+        return (KIND_TAGS, *strings.add(_TAG_SEP.join(value).encode("utf-8")))
+    return (KIND_JSON, *strings.add(json_codec.dumps(value)))
+
+
+def encode_shared_snapshot(data: Mapping[str, Any], source_mtime: float, generation: int) -> bytes:
+    jobs = list(data.get("jobs") or ())
+    strings = _StringTable()
+    table = bytearray()
+    for job in jobs:
+        cells = [(KIND_ABSENT, 0, 0)] * _COLUMNS
+        extras: dict[str, Any] = {}
+        for key, value in job.items():
+            index = _FIELD_INDEX.get(key)
+            if index is None:
+                extras[key] = value
+            else:
+                cells[index] = _encode_cell(strings, key, value)
+        if extras:
+            cells[_EXTRAS] = (KIND_JSON, *strings.add(json_codec.dumps(extras)))
+        for cell in cells:
+            table += _CELL.pack(*cell)
+    meta = json_codec.dumps({k: v for k, v in data.items() if k != "jobs"})
+    table_off = _HEADER.size
+    meta_off = table_off + len(table)
+    strings_off = meta_off + len(meta)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, generation, source_mtime, len(jobs), table_off, meta_off, len(meta), strings_off
+    )
+    return b"".join((header, table, meta, strings.blob))
+
+
+class SharedJobStore:
+    """Read-only view of one shared snapshot file (kept mapped while referenced)."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            fmt,
+            self.generation,
+            self.source_mtime,
+            self.job_count,
+            self._table,
+            meta_off,
+            meta_len,
+            self._strings,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"not a shared job snapshot (format {fmt}): {path}")
+        self.meta: dict[str, Any] = json_codec.loads(self._mm[meta_off : meta_off + meta_len])
+
+    def _value(self, row: int, column: int) -> Any:
+        kind, offset, length = _CELL.unpack_from(self._mm, self._table + row * _ROW_SIZE + column * _CELL.size)
+        if kind == KIND_ABSENT:
+            return _ABSENT
+        start = self._strings + offset
+        raw = self._mm[start : start + length]
+        if kind == KIND_STR:
+            return raw.decode("utf-8")
+        if kind == KIND_TAGS:
+            return tuple(raw.decode("utf-8").split(_TAG_SEP)) if raw else ()
+        return json_codec.loads(raw)
+
+    def row(self, row: int) -> dict[str, Any]:
+        """Job dict of one row, in JOB_FIELDS order followed by the extra keys."""
+        job: dict[str, Any] = {}
+        for i, name in enumerate(JOB_FIELDS):
+            value = self._value(row, i)
+            if value is not _ABSENT:
+                job[name] = value
+        extras = self._value(row, _EXTRAS)
+        if extras is not _ABSENT:
+            job.update(extras)
+        return job
+
+    def records(self) -> tuple[JobRecord, ...]:
+        """Every row decoded once into a JobRecord owned by this worker."""
+        return tuple(JobRecord(self.row(i)) for i in range(self.job_count))
+
+
+@contextmanager
+def _host_lock(path: str) -> Iterator[None]:
+    with open(f"{path}.lock", "a+b") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def shared_snapshot_generation(path: str) -> int | None:
+    """Generation of the shared file at path, None if missing/invalid (reads the header only)."""
+    header = _read_header(path)
+    return header[0] if header else None
+
+
+def _read_header(path: str) -> tuple[int, float] | None:
+    """(generation, source mtime) of an existing shared file, None if missing/invalid."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(head) < _HEADER.size:
+        return None
+    magic, fmt, generation, source_mtime, *_ = _HEADER.unpack(head)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return None
+    return generation, source_mtime
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".starful-snap-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)  # mapped readers keep the old inode until they re-attach
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def attach_shared_snapshot(data_file: str, shared_path: str, source_mtime: float) -> SharedJobStore:
+    """Map shared_path, first rewriting it from data_file if built from another mtime.
+
+    Only one process per host rewrites (flock); the others wait, then map the result.
+    """
+    with _host_lock(shared_path):
+        header = _read_header(shared_path)
+        if header is None or header[1] != source_mtime:
+            generation = (header[0] if header else 0) + 1
+            data = json_codec.load_file(data_file)
+            _write_atomic(shared_path, encode_shared_snapshot(data, source_mtime, generation))
+        return SharedJobStore(shared_path)
@@ -0,0 +1,151 @@
+"""Typeahead suggestions for the search box (/api/suggest).
+
+Career titles, tags and SEARCH_SYNONYMS groups go into prefix tries built once
+per job snapshot. Keys are normalized like search queries (normalize_search_text:
+NFKC width folding, lowercase, single spaces), so "ﾃﾞｰﾀ", "データ" and "ＤＡＴＡ"
+reach the same nodes. Every node keeps its best SUGGEST_LIMIT items, so a lookup
+costs one dict step per query character whatever the catalogue size.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Mapping, Sequence
+from urllib.parse import quote
+
+from app.services.derived_views import derived_view
+from app.services.job_snapshot import JobSnapshot
+from app.services.search import SEARCH_SYNONYMS, normalize_search_text
+
+# Most suggestions of each kind per response (and per trie node)
+SUGGEST_LIMIT = 8
+# Keys are indexed up to this many characters; longer queries get no suggestions
+SUGGEST_KEY_CHARS = 32
+
+# A title or tag can also be found from the start of any of its words.
+_WORD_START = re.compile(r"(?<=[\s/・･(（\-])\S")
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.top: list[int] = []
+
+
+class PrefixTrie:
+    """Normalized keys → item indexes; node.top holds the best `limit` items below it.
+
+    Items must be added best first: a node's list is filled in insertion order and
+    then closed, which keeps building linear in the total key length.
+    """
+
+    def __init__(self, items: Iterable[tuple[Iterable[str], Any]], limit: int = SUGGEST_LIMIT):
+        self.limit = limit
+        self.items: list[Any] = []
+        self._root = _Node()
+        self.nodes = 1
+        for keys, item in items:
+            index = len(self.items)
+            self.items.append(item)
+            for key in keys:
+                self._insert(key[:SUGGEST_KEY_CHARS], index)
+
+    def _insert(self, key: str, index: int) -> None:
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+                self.nodes += 1
+            node = child
+            # Several keys of one item share prefixes; it is listed once.
+            if len(node.top) < self.limit and (not node.top or node.top[-1] != index):
+                node.top.append(index)
+
+    def lookup(self, prefix: str, k: int | None = None) -> list[Any]:
+        """Best items whose keys start with prefix (already normalized)."""
+        if not prefix:
+            return []
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)  # type: ignore[assignment]
+            if node is None:
+                return []
+        return [self.items[i] for i in node.top[:k]]
+
+
+def suggestion_keys(text: str) -> list[str]:
+    """Normalized text plus its suffixes starting at each later word."""
+    normalized = normalize_search_text(text)
+    if not normalized:
+        return []
+    return [normalized] + [normalized[m.start() :] for m in _WORD_START.finditer(normalized)]
+
+
+def _search_url(query: str) -> str:
+    return f"/search?q={quote(query)}"
+
+
+class Suggester:
+    """One trie per suggestion kind for a snapshot; see suggest().
+
+    version / mtime identify the snapshot it was built from (response validators).
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[Any],
+        by_tag: Mapping[str, Sequence[Any]],
+        version: int = 0,
+        mtime: float = 0.0,
+    ):
+        self.version = version
+        self.mtime = mtime
+        # Careers: newest first (snapshot.jobs order), as on the home page.
+        self.careers = PrefixTrie(
+            (
+                suggestion_keys(job.get("title") or ""),
+                {
+                    "id": job["id"],
+                    "title": job.get("title") or "",
+                    "url": job.get("link") or f"/career/{job['id']}",
+                },
+            )
+            for job in jobs
+            if job.get("id")
+        )
+        # Tags: most used first.
+        tags = sorted(by_tag.items(), key=lambda item: (-len(item[1]), item[0]))
+        self.tags = PrefixTrie(
+            (suggestion_keys(tag), {"tag": tag, "count": len(tagged), "url": _search_url(tag)})
+            for tag, tagged in tags
+        )
+        self.synonyms = PrefixTrie(
+            (
+                [key for term in sorted(terms) for key in suggestion_keys(term)],
+                {"key": group, "terms": sorted(terms), "url": _search_url(group)},
+            )
+            for group, terms in SEARCH_SYNONYMS.items()
+        )
+
+    def suggest(self, query: str, k: int = SUGGEST_LIMIT) -> dict[str, Any]:
+        prefix = normalize_search_text(query)
+        if len(prefix) > SUGGEST_KEY_CHARS:
+            prefix = ""
+        return {
+            "query": prefix,
+            "careers": self.careers.lookup(prefix, k),
+            "tags": self.tags.lookup(prefix, k),
+            "synonyms": self.synonyms.lookup(prefix, k),
+        }
+
+    def __len__(self) -> int:
+        return self.careers.nodes + self.tags.nodes + self.synonyms.nodes
+
+
+# Eager: built by the reload / content watcher path when a snapshot is published,
+# so /api/suggest only ever reads snapshot_suggester.latest().
+@derived_view("suggest", eager=True)
+def snapshot_suggester(snapshot: JobSnapshot) -> Suggester:
+    return Suggester(snapshot.jobs, snapshot.by_tag, snapshot.version, snapshot.mtime)
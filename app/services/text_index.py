@@ -0,0 +1,452 @@
+"""Text indexes for search (no app imports; scripts load it).
+
+Tokens: runs of ASCII letters/digits are words; runs of other word characters
+(kana, kanji, ...) become character bigrams, a lone character stays a unigram.
+
+InvertedIndex narrows substring searches over short fields without changing
+their result: a text can only contain a term if it has every token of the term
+(or, for words and lone characters, a token containing it), so candidates()
+never drops a match.
+
+BodyIndex is a BM25 index over guide bodies, written by scripts/build_data.py
+(encode_body_index) and memory-mapped at runtime. PatchedBodyIndex lays edited
+guide texts over it until the next build (content hot reload).
+"""
+from __future__ import annotations
+
+import math
+import mmap
+import re
+import struct
+import unicodedata
+import zlib
+from typing import Iterable, Iterator, Sequence
+
+# Input is already lowercased (search.normalize_search_text).
+_RUNS = re.compile(r"[0-9a-z]+|[^\W0-9a-zA-Z_]+")
+
+
+def _is_word(run: str) -> bool:
+    return run[0] < "\x80"
+
+
+def tokenize(text: str) -> set[str]:
+    tokens: set[str] = set()
+    for run in _RUNS.findall(text):
+        if _is_word(run) or len(run) == 1:
+            tokens.add(run)
+        else:
+            tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _add_document(postings: dict[str, list[int]], doc_id: int, texts: Iterable[str]) -> None:
+    tokens: set[str] = set()
+    for text in texts:
+        tokens |= tokenize(text)
+    for token in tokens:
+        postings.setdefault(token, []).append(doc_id)
+
+
+class InvertedIndex:
+    """token → ids of the documents containing it; a document is several texts."""
+
+    def __init__(self, documents: Iterable[Iterable[str]]):
+        postings: dict[str, list[int]] = {}
+        count = 0
+        for doc_id, texts in enumerate(documents):
+            count += 1
+            _add_document(postings, doc_id, texts)
+        self._set(postings, count)
+
+    def _set(self, postings: dict[str, list[int]], size: int) -> None:
+        self.size = size
+        self.postings: dict[str, tuple[int, ...]] = {t: tuple(ids) for t, ids in postings.items()}
+        # Words and lone characters can match inside longer tokens ("end" in "backend").
+        self._words = tuple(t for t in self.postings if _is_word(t))
+        self._bigrams = tuple(t for t in self.postings if not _is_word(t))
+
+    def updated(
+        self,
+        remap: Sequence[int | None],
+        added: Iterable[tuple[int, Iterable[str]]],
+        size: int,
+    ) -> "InvertedIndex":
+        """New index: document i becomes remap[i] (None drops it) and the `added`
+        (doc id, texts) are tokenized; kept documents are not re-tokenized."""
+        postings: dict[str, list[int]] = {}
+        for token, ids in self.postings.items():
+            kept = [remap[i] for i in ids if remap[i] is not None]
+            if kept:
+                postings[token] = kept
+        for doc_id, texts in added:
+            _add_document(postings, doc_id, texts)
+        for ids in postings.values():
+            ids.sort()
+        index = object.__new__(InvertedIndex)
+        index._set(postings, size)
+        return index
+
+    def _containing(self, token: str) -> set[int]:
+        vocabulary = self._words if _is_word(token) else self._bigrams
+        ids: set[int] = set()
+        for candidate in vocabulary:
+            if token in candidate:
+                ids.update(self.postings[candidate])
+        return ids
+
+    def candidates(self, term: str) -> set[int] | None:
+        """Ids of documents that may contain term as a substring of one text.
+
+        None when the term has no tokens (only punctuation): nothing to narrow by.
+        """
+        exact: list[tuple[int, ...]] = []
+        partial: list[str] = []
+        for run in _RUNS.findall(term):
+            if _is_word(run) or len(run) == 1:
+                partial.append(run)
+            else:
+                exact.extend(self.postings.get(run[i : i + 2], ()) for i in range(len(run) - 1))
+        if not exact and not partial:
+            return None
+        exact.sort(key=len)
+        ids = set(exact[0]) if exact else self._containing(partial.pop())
+        for posting in exact[1:]:
+            if not ids:
+                break
+            ids.intersection_update(posting)
+        for token in partial:
+            if not ids:
+                break
+            ids &= self._containing(token)
+        return ids
+
+
+# --- BM25 over guide bodies -------------------------------------------------
+
+BODY_MAGIC = b"SFBM"
+BODY_FORMAT_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# magic, format, docs, terms, avg doc length, docs/terms/postings/strings offsets
+_BODY_HEADER = struct.Struct("<4sIIIdQQQQ")
+# id offset, id length, zlib text offset, zlib text length, length in tokens
+_BODY_DOC = struct.Struct("<IIIII")
+# term offset, term length, postings byte offset, document frequency
+_BODY_TERM = struct.Struct("<IIII")
+# Postings are varints: (document - previous document, term frequency) per entry.
+
+_MD_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MD_LINE_MARK = re.compile(r"^[ \t]*(?:#{1,6}|>|[-+*]|\d+\.)[ \t]+", re.M)
+_MD_TABLE_RULE = re.compile(r"^[ \t]*\|?[ \t:|-]+\|?[ \t]*$", re.M)
+_MD_INLINE = re.compile(r"<[^>]+>|[*`~|]+")
+_SPACES = re.compile(r"\s+")
+_ASCII_WORD = frozenset("0123456789abcdefghijklmnopqrstuvwxyz")
+
+
+def markdown_plain_text(body: str) -> str:
+    """Guide Markdown as one line of NFKC text (markup, links and images removed)."""
+    text = _MD_IMAGE.sub(" ", body)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_TABLE_RULE.sub(" ", text)
+    text = _MD_LINE_MARK.sub("", text)
+    text = _MD_INLINE.sub(" ", text)
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def _fold(text: str) -> str:
+    # As search.normalize_search_text, minus whitespace handling tokens ignore.
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def iter_tokens(text: str) -> Iterator[str]:
+    """tokenize() with repeats, for term frequencies; text must be folded."""
+    for run in _RUNS.findall(text):
+        if _is_word(run) or len(run) == 1:
+            yield run
+        else:
+            for i in range(len(run) - 1):
+                yield run[i : i + 2]
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _read_varints(data: bytes, count: int) -> Iterator[int]:
+    pos = 0
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        yield value
+
+
+def encode_body_index(docs: Iterable[tuple[str, str]]) -> bytes:
+    """BodyIndex file for (doc id, markdown_plain_text) pairs.
+
+    Texts are stored zlib-compressed, per document, for snippets."""
+    strings = bytearray()
+    doc_rows: list[tuple[int, int, int, int, int]] = []
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for doc, (doc_id, text) in enumerate(docs):
+        counts: dict[str, int] = {}
+        length = 0
+        for token in iter_tokens(_fold(text)):
+            counts[token] = counts.get(token, 0) + 1
+            length += 1
+        for token, tf in counts.items():
+            postings.setdefault(token, []).append((doc, tf))
+        id_bytes, text_bytes = doc_id.encode("utf-8"), zlib.compress(text.encode("utf-8"), 9)
+        doc_rows.append((len(strings), len(id_bytes), len(strings) + len(id_bytes), len(text_bytes), length))
+        strings += id_bytes + text_bytes
+
+    term_rows = bytearray()
+    posting_rows = bytearray()
+    # Sorted by UTF-8 bytes: BodyIndex binary-searches the mapped bytes directly.
+    for term_bytes, token in sorted((t.encode("utf-8"), t) for t in postings):
+        entries = postings[token]
+        term_rows += _BODY_TERM.pack(len(strings), len(term_bytes), len(posting_rows), len(entries))
+        strings += term_bytes
+        previous = 0
+        for doc, tf in entries:  # ascending doc order
+            posting_rows += _varint(doc - previous) + _varint(tf)
+            previous = doc
+
+    docs_table = b"".join(_BODY_DOC.pack(*row) for row in doc_rows)
+    avgdl = sum(row[4] for row in doc_rows) / len(doc_rows) if doc_rows else 0.0
+    docs_off = _BODY_HEADER.size
+    terms_off = docs_off + len(docs_table)
+    postings_off = terms_off + len(term_rows)
+    strings_off = postings_off + len(posting_rows)
+    header = _BODY_HEADER.pack(
+        BODY_MAGIC,
+        BODY_FORMAT_VERSION,
+        len(doc_rows),
+        len(postings),
+        avgdl,
+        docs_off,
+        terms_off,
+        postings_off,
+        strings_off,
+    )
+    return b"".join((header, docs_table, term_rows, posting_rows, strings))
+
+
+class BodyIndex:
+    """Read-only BM25 index file (memory-mapped; only doc ids and lengths are loaded)."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            fmt,
+            self.doc_count,
+            self.term_count,
+            self.avgdl,
+            self._docs,
+            self._terms,
+            self._postings,
+            self._strings,
+        ) = _BODY_HEADER.unpack_from(self._mm, 0)
+        if magic != BODY_MAGIC or fmt != BODY_FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"not a body index (format {fmt}): {path}")
+        docs = [self._doc(d) for d in range(self.doc_count)]
+        self.doc_ids = tuple(self._string(row[0], row[1]).decode("utf-8") for row in docs)
+        self._lengths = tuple(row[4] for row in docs)
+        self._doc_numbers = {doc_id: d for d, doc_id in enumerate(self.doc_ids)}
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __del__(self) -> None:
+        # BodyIndexFile swaps indexes while requests may still read the old one,
+        # so the mapping is released with the last reference rather than at swap.
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            mm.close()
+
+    def _doc(self, doc: int) -> tuple[int, int, int, int, int]:
+        return _BODY_DOC.unpack_from(self._mm, self._docs + doc * _BODY_DOC.size)
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self._mm[start : start + length]
+
+    def _find(self, token: str) -> tuple[int, int] | None:
+        """(postings offset, df) of token, by binary search over the sorted terms."""
+        key = token.encode("utf-8")
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, first, df = _BODY_TERM.unpack_from(self._mm, self._terms + mid * _BODY_TERM.size)
+            term = self._string(offset, length)
+            if term < key:
+                lo = mid + 1
+            elif term > key:
+                hi = mid
+            else:
+                return first, df
+        return None
+
+    def idf(self, token: str) -> float:
+        """BM25 idf of token; unseen tokens count as found in one document."""
+        found = self._find(token)
+        df = found[1] if found is not None else 1
+        return math.log((self.doc_count - df + 0.5) / (df + 0.5) + 1)
+
+    def _term_score(self, idf: float, tf: int, length: int) -> float:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self.avgdl or 1.0))
+        return idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def _best(self, tokens: int) -> float:
+        # 1.0 relevance: every token at saturated frequency with the idf of df=1.
+        return tokens * math.log((self.doc_count - 0.5) / 1.5 + 1) * (BM25_K1 + 1)
+
+    def scores(self, query: str) -> dict[str, float]:
+        """doc id → BM25 relevance of the query, 0..1, for documents with any token.
+
+        1.0 would be every query token at saturated frequency with the idf of a
+        term found in one document; tokens common to every guide add ~0.
+        """
+        n = self.doc_count
+        tokens = list(dict.fromkeys(iter_tokens(_fold(query))))
+        if not n or not tokens:
+            return {}
+        best = self._best(len(tokens))
+        out: dict[int, float] = {}
+        for token in tokens:
+            found = self._find(token)
+            if found is None:
+                continue
+            offset, df = found
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1)
+            start = self._postings + offset
+            # A varint is at most 5 bytes for these values.
+            values = _read_varints(self._mm[start : start + df * 10], df * 2)
+            doc = 0
+            for delta, tf in zip(values, values):
+                doc += delta
+                out[doc] = out.get(doc, 0.0) + self._term_score(idf, tf, self._lengths[doc])
+        return {self.doc_ids[doc]: min(score / best, 1.0) for doc, score in out.items()}
+
+    def text(self, doc_id: str) -> str | None:
+        doc = self._doc_numbers.get(doc_id)
+        if doc is None:
+            return None
+        _, _, offset, length, _ = self._doc(doc)
+        return zlib.decompress(self._string(offset, length)).decode("utf-8")
+
+    def snippet(self, doc_id: str, query: str, width: int = 80) -> tuple[str, str, str] | None:
+        """(before, match, after) around the first hit of the query (or its longest
+        token) in the document text; None if it does not occur."""
+        return text_snippet(self.text(doc_id), query, width)
+
+    def patched(self, texts: dict[str, str | None]) -> "PatchedBodyIndex":
+        return PatchedBodyIndex(self, texts)
+
+
+class PatchedBodyIndex:
+    """A BodyIndex with some documents replaced, added or (text None) removed.
+
+    Replaced documents are scored from their own token counts with the base
+    index's idf and average length, so relevance stays on the same 0..1 scale.
+    """
+
+    def __init__(self, base: BodyIndex, texts: dict[str, str | None]):
+        self.base = base
+        # doc id → (text, token counts, length), or None when removed
+        self.docs: dict[str, tuple[str, dict[str, int], int] | None] = {}
+        for doc_id, text in texts.items():
+            if text is None:
+                self.docs[doc_id] = None
+                continue
+            counts: dict[str, int] = {}
+            length = 0
+            for token in iter_tokens(_fold(text)):
+                counts[token] = counts.get(token, 0) + 1
+                length += 1
+            self.docs[doc_id] = (text, counts, length)
+
+    def scores(self, query: str) -> dict[str, float]:
+        base = self.base
+        out = {d: s for d, s in base.scores(query).items() if d not in self.docs}
+        tokens = list(dict.fromkeys(iter_tokens(_fold(query))))
+        if not base.doc_count or not tokens:
+            return out
+        best = base._best(len(tokens))
+        idfs = {token: base.idf(token) for token in tokens}
+        for doc_id, doc in self.docs.items():
+            if doc is None:
+                continue
+            _, counts, length = doc
+            score = sum(
+                base._term_score(idfs[t], counts[t], length) for t in tokens if t in counts
+            )
+            if score:
+                out[doc_id] = min(score / best, 1.0)
+        return out
+
+    def text(self, doc_id: str) -> str | None:
+        if doc_id in self.docs:
+            doc = self.docs[doc_id]
+            return doc[0] if doc is not None else None
+        return self.base.text(doc_id)
+
+    def snippet(self, doc_id: str, query: str, width: int = 80) -> tuple[str, str, str] | None:
+        return text_snippet(self.text(doc_id), query, width)
+
+    def close(self) -> None:
+        self.base.close()
+
+    def patched(self, texts: dict[str, str | None]) -> "PatchedBodyIndex":
+        merged = PatchedBodyIndex(self.base, texts)
+        merged.docs = {**self.docs, **merged.docs}
+        return merged
+
+
+def _find_word(folded: str, needle: str) -> int:
+    """Offset of needle in folded text; Latin/digit ends must sit on word boundaries
+    ("ai" does not match inside "airflow"), CJK runs match anywhere."""
+    pattern = re.escape(needle)
+    if needle[0] in _ASCII_WORD:
+        pattern = r"(?<![0-9a-z])" + pattern
+    if needle[-1] in _ASCII_WORD:
+        pattern += r"(?![0-9a-z])"
+    match = re.search(pattern, folded)
+    return match.start() if match else -1
+
+
+def text_snippet(text: str | None, query: str, width: int = 80) -> tuple[str, str, str] | None:
+    """BodyIndex.snippet for a document text."""
+    if not text:
+        return None
+    folded = text.lower()
+    if len(folded) != len(text):  # rare case-mapping length change: offsets unusable
+        return None
+    needles = [_SPACES.sub(" ", _fold(query)).strip()]
+    needles += sorted(set(iter_tokens(needles[0])), key=len, reverse=True)
+    for needle in needles:
+        pos = _find_word(folded, needle) if needle else -1
+        if pos >= 0:
+            end = pos + len(needle)
+            start = max(0, pos - width // 2)
+            stop = min(len(text), end + width // 2)
+            before = ("…" if start else "") + text[start:pos]
+            after = text[end:stop] + ("…" if stop < len(text) else "")
+            return before, text[pos:end], after
+    return None
@@ -59,12 +59,12 @@ def career_thumbnail_url(gcs_base: str, career_id: str) -> str:
     return f"{gcs_base.rstrip('/')}/{career_id}.png"
 
 
-def load_career_meta(career_id: str, parse_md) -> dict:
+def load_career_meta(career_id: str, read_meta) -> dict:
+    """Frontmatter for career_id; read_meta(filepath) is e.g. md_parser.read_starful_meta."""
     filepath = os.path.join(CONTENTS_DIR, f"{career_id}.md")
     if not os.path.exists(filepath):
         raise FileNotFoundError(career_id)
-    meta, _ = parse_md(filepath)
-    return meta
+    return read_meta(filepath)
 
 
 def jpeg_bytes(img) -> bytes:
@@ -1,8 +1,27 @@
 """Shared Jinja2 templates instance."""
 from __future__ import annotations
 
+import hashlib
+import os
+
 from fastapi.templating import Jinja2Templates
 
 from app.config import TEMPLATE_DIR
 
 templates = Jinja2Templates(directory=TEMPLATE_DIR)
+
+
+def _template_version() -> tuple[str, float]:
+    """(digest, newest mtime) of all template files; templates ship with the image."""
+    digest = hashlib.sha1()
+    newest = 0.0
+    for root, _dirs, files in sorted(os.walk(TEMPLATE_DIR)):
+        for name in sorted(files):
+            st = os.stat(os.path.join(root, name))
+            rel = os.path.relpath(os.path.join(root, name), TEMPLATE_DIR)
+            digest.update(f"{rel}:{st.st_mtime_ns}:{st.st_size};".encode("utf-8"))
+            newest = max(newest, st.st_mtime)
+    return digest.hexdigest()[:12], newest
+
+
+TEMPLATE_VERSION, TEMPLATE_MTIME = _template_version()
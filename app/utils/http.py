@@ -1,7 +1,11 @@
 """HTTP request helpers."""
 from __future__ import annotations
 
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+
 from fastapi import Request
+from fastapi.responses import Response
 
 
 def get_client_ip(request: Request) -> str:
@@ -11,3 +15,82 @@ def get_client_ip(request: Request) -> str:
     if request.client:
         return request.client.host or "unknown"
     return "unknown"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag from content version parts (mtimes, data versions, template version)."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def validator_headers(etag: str, last_modified: float | None = None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+# Per-encoding ETag suffix; strong ETags must differ across Content-Encodings.
+ENCODING_ETAG_SUFFIXES = {"br": "-br", "gzip": "-gz"}
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    suffix = ENCODING_ETAG_SUFFIXES.get(encoding)
+    if not suffix:
+        return etag
+    return f'{etag[:-1]}{suffix}"'
+
+
+def _etag_base(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    for suffix in ENCODING_ETAG_SUFFIXES.values():
+        if tag.endswith(f'{suffix}"'):
+            return f'{tag[: -len(suffix) - 1]}"'
+    return tag
+
+
+def _matching_etag(if_none_match: str, etag: str) -> str | None:
+    """The If-None-Match entry matching etag (any encoding variant), or None."""
+    if if_none_match.strip() == "*":
+        return etag
+    base = _etag_base(etag)
+    for candidate in if_none_match.split(","):
+        if _etag_base(candidate) == base:
+            return candidate.strip().removeprefix("W/")
+    return None
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    return int(last_modified) <= since
+
+
+def not_modified_response(
+    request: Request, etag: str, last_modified: float | None = None
+) -> Response | None:
+    """304 response when the request's validators match, else None.
+
+    If-None-Match wins over If-Modified-Since (RFC 9110 §13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _matching_etag(if_none_match, etag)
+        if matched is None:
+            return None
+        # Echo the representation's ETag (e.g. the "-br" variant the client holds).
+        etag = matched
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if not (
+            if_modified_since
+            and last_modified
+            and _not_modified_since(if_modified_since, last_modified)
+        ):
+            return None
+    headers = validator_headers(etag, last_modified)
+    # A 304 carries the Vary of the 200 it stands for (RFC 9110 §15.4.5).
+    headers["Vary"] = "Accept-Encoding"
+    return Response(status_code=304, headers=headers)
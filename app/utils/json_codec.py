@@ -0,0 +1,42 @@
+"""JSON codec: orjson when installed, stdlib json otherwise (no app imports)."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json fallback
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON (non-ASCII kept), as Starlette's JSONResponse renders it."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def load_file(path: str) -> Any:
+    """Parse a UTF-8 JSON file (read as bytes; orjson parses them without decoding)."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(); default_response_class for the /api routers."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -6,39 +6,79 @@ from datetime import datetime
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, os.path.join(BASE_DIR, "scripts"))
-from slug_utils import normalize_slug
-from md_metadata import parse_starful_md, published_date, ensure_published_at, write_starful_md
+from md_metadata import (
+    load_app_module,
+    read_starful_md,
+    published_date,
+    ensure_published_at,
+    write_starful_md,
+)
 
 # 경로 설정
 CONTENT_DIR = os.path.join(BASE_DIR, 'app', 'contents')
 JSON_OUTPUT = os.path.join(BASE_DIR, 'app/static/json/job_data.json')
 SITEMAP_OUTPUT = os.path.join(BASE_DIR, 'app/static/sitemap.xml')
+PRERENDER_OUTPUT = os.path.join(BASE_DIR, 'app/prerender/career_pages.json')
+BODY_INDEX_OUTPUT = os.path.join(BASE_DIR, 'app/prerender/body_index.bin')
 BASE_URL = 'https://starful.biz'
 
+job_records = load_app_module("services/job_records.py")
+text_index = load_app_module("services/text_index.py")
 
-def parse_starful_md_file(filepath):
-    """Starful ---json MD → metadata dict."""
+
+def load_prerenderer():
+    """(career_render, seo_helpers) modules, or None when markdown is not installed."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
-        parsed = parse_starful_md(raw_content)
-        if not parsed:
-            return None
-        meta, body = parsed
-        meta, date, changed = ensure_published_at(meta, filepath)
-        if changed:
-            write_starful_md(filepath, meta, body)
-        meta["published_at"] = date
-        return meta
-    except Exception as e:
-        print(f"❌ 파싱 에러 ({os.path.basename(filepath)}): {e}")
+        return load_app_module("career_render.py"), load_app_module("seo_helpers.py")
+    except ImportError as e:
+        print(f"⚠️ 프리렌더 생략 (markdown 미설치): {e}")
         return None
 
 
+def prerender_entry(prerenderer, meta, body, filepath):
+    """career_pages.json entry; source stat lets the app detect stale entries."""
+    career_render, seo_helpers = prerenderer
+    st = os.stat(filepath)
+    entry = career_render.render_career_artifact(meta, body)
+    entry["meta"] = meta
+    entry["faq_items"] = seo_helpers.extract_faq_from_markdown(body)
+    entry["source"] = {"mtime": int(st.st_mtime), "size": st.st_size}
+    return entry
+
+
+def write_prerender_bundle(prerenderer, careers):
+    career_render, _ = prerenderer
+    bundle = {
+        "version": career_render.RENDER_VERSION,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "careers": careers,
+    }
+    os.makedirs(os.path.dirname(PRERENDER_OUTPUT), exist_ok=True)
+    tmp_path = PRERENDER_OUTPUT + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, PRERENDER_OUTPUT)
+    print(f"🧱 프리렌더 완료: {len(careers)}개 → {PRERENDER_OUTPUT}")
+
+
+def write_body_index(docs):
+    """BM25 index of guide bodies for /search (app/services/text_index.py format)."""
+    payload = text_index.encode_body_index(docs)
+    os.makedirs(os.path.dirname(BODY_INDEX_OUTPUT), exist_ok=True)
+    tmp_path = BODY_INDEX_OUTPUT + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, BODY_INDEX_OUTPUT)
+    print(f"🔎 본문 인덱스 완료: {len(docs)}개 ({len(payload) / 1024:.0f} KiB) → {BODY_INDEX_OUTPUT}")
+
+
 def main():
     print(f"🔨 Starful 데이터 빌드 시작 (대상: {CONTENT_DIR})")
     jobs = []
     backfilled = 0
+    prerenderer = load_prerenderer()
+    prerendered = {}
+    body_docs = []
 
     if not os.path.exists(CONTENT_DIR):
         print(f"❌ 폴더 없음: {CONTENT_DIR}")
@@ -48,9 +88,7 @@ def main():
         if not filename.endswith('.md'):
             continue
         filepath = os.path.join(CONTENT_DIR, filename)
-        with open(filepath, encoding='utf-8') as f:
-            raw = f.read()
-        parsed = parse_starful_md(raw)
+        parsed = read_starful_md(filepath)
         if not parsed:
             continue
         meta, body = parsed
@@ -59,16 +97,11 @@ def main():
             write_starful_md(filepath, meta, body)
             backfilled += 1
 
-        job_id = normalize_slug(meta.get("slug") or filename.replace(".md", ""))
-        jobs.append({
-            "id": job_id,
-            "title": meta.get('title', 'No Title'),
-            "category": meta.get('category', 'engineering'),
-            "meta_description": meta.get('meta_description', '')[:160],
-            "tags": meta.get('tags', []),
-            "published": published_date(meta, filepath),
-            "link": f"/career/{job_id}",
-        })
+        job_id = job_records.career_id_for(filename, meta)
+        jobs.append(job_records.job_from_meta(job_id, meta, published_date(meta, filepath)))
+        if prerenderer:
+            prerendered[job_id] = prerender_entry(prerenderer, meta, body, filepath)
+        body_docs.append((job_id, text_index.markdown_plain_text(body)))
 
     jobs.sort(key=lambda x: (x['published'], x['id']), reverse=True)
 
@@ -82,6 +115,10 @@ def main():
     with open(JSON_OUTPUT, 'w', encoding='utf-8') as f:
         json.dump(final_data, f, ensure_ascii=False, indent=2)
 
+    if prerenderer:
+        write_prerender_bundle(prerenderer, prerendered)
+    write_body_index(body_docs)
+
     if backfilled:
         print(f"📅 published_at 백필: {backfilled}개 MD")
     print(f"🎉 빌드 완료! 총 {len(jobs)}개 데이터를 {JSON_OUTPUT}에 저장했습니다.")
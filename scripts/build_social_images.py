@@ -13,7 +13,8 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
-from app import GCS_IMG_BASE, parse_starful_md
+from app import GCS_IMG_BASE
+from app.md_parser import read_starful_meta
 from app.social_share import (
     career_thumbnail_url,
     fetch_social_jpeg,
@@ -41,7 +42,7 @@ def build_career_images() -> None:
         image_key = static_social_image_key(slug)
         output_path = os.path.join(OUTPUT_DIR, f"{image_key}.jpg")
         try:
-            load_career_meta(slug, parse_starful_md)
+            load_career_meta(slug, read_starful_meta)
             source = career_thumbnail_url(GCS_IMG_BASE, slug)
             data = fetch_social_jpeg(source)
             with open(output_path, "wb") as handle:
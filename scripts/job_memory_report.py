@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Memory report: job_data.json jobs as dicts vs JobRecord (app/services/job_records.py).
+
+Builds a synthetic catalogue by repeating app/static/json/job_data.json with
+unique ids, then measures retained memory (tracemalloc) of the parsed dicts and
+of the JobRecords built from them, plus the cost of enriching the whole list for
+the home page (content_new.enrich_items: dict copies vs BadgedJob views). The
+"shared" row is one worker's JobRecords decoded from a STARFUL_SHARED_SNAPSHOT
+file (app/services/shared_snapshot.py); the file itself is counted once per host.
+
+Usage:
+  python scripts/job_memory_report.py                # 50,000 jobs
+  python scripts/job_memory_report.py --jobs 100000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from md_metadata import APP_DIR, load_app_module  # noqa: E402
+
+job_records = load_app_module("services/job_records.py")
+content_new = load_app_module("content_new.py")
+
+DATA_FILE = APP_DIR / "static" / "json" / "job_data.json"
+
+
+def synthetic_jobs_json(count: int) -> str:
+    with open(DATA_FILE, encoding="utf-8") as f:
+        base = json.load(f)["jobs"]
+    jobs = []
+    for i in range(count):
+        job = dict(base[i % len(base)])
+        job["id"] = f"{job['id']}_{i}"
+        job["link"] = f"/career/{job['id']}"
+        jobs.append(job)
+    return json.dumps({"total_count": count, "jobs": jobs}, ensure_ascii=False)
+
+
+def retained(build: Callable[[], Any]) -> tuple[Any, int]:
+    """(result, bytes still allocated by build() once it returns)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50_000, help="synthetic catalogue size")
+    parser.add_argument("--repeat", type=int, default=3, help="enrich runs; best time is reported")
+    args = parser.parse_args()
+
+    raw = synthetic_jobs_json(args.jobs)
+    dicts, dict_bytes = retained(lambda: json.loads(raw)["jobs"])
+    # Parsed dicts are dropped as each record is built, so this includes the strings.
+    records, record_bytes = retained(
+        lambda: tuple(job_records.JobRecord(j) for j in json.loads(raw)["jobs"])
+    )
+
+    cases = [("dict", dicts, dict_bytes), ("JobRecord", records, record_bytes)]
+    # Imports the app package (shared_snapshot depends on app modules).
+    sys.path.insert(0, str(APP_DIR.parent))
+    from app.services import shared_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "job_data.json")
+        with open(data_file, "w", encoding="utf-8") as f:
+            f.write(raw)
+        store = shared_snapshot.attach_shared_snapshot(data_file, os.path.join(tmp, "jobs.snap"), 1.0)
+        shared, shared_bytes = retained(store.records)
+        file_bytes = os.path.getsize(os.path.join(tmp, "jobs.snap"))
+    cases.append(("shared", shared, shared_bytes))
+
+    cutoff = content_new.new_content_cutoff()
+    rows = []
+    for label, jobs, size in cases:
+        _, enriched = retained(lambda: content_new.enrich_items(jobs, cutoff=cutoff))
+        ms = best_ms(lambda: content_new.enrich_items(jobs, cutoff=cutoff), args.repeat)
+        rows.append((label, size, enriched, ms))
+
+    n = len(dicts)
+    mib = 1024 * 1024
+    print(f"jobs: {n:,}  (job_data.json size {len(raw.encode()) / mib:.1f} MiB)")
+    print(f"{'':12}{'catalogue MiB':>15}{'bytes/job':>11}{'enriched MiB':>14}{'enrich ms':>11}")
+    for label, size, enriched, ms in rows:
+        print(f"{label:12}{size / mib:15.1f}{size / n:11.0f}{enriched / mib:14.1f}{ms:11.1f}")
+    saved = dict_bytes - record_bytes
+    print(f"catalogue saved: {saved / mib:.1f} MiB ({saved / max(dict_bytes, 1):.0%})")
+    print(f"shared snapshot file: {file_bytes / mib:.1f} MiB per host (decoded by every worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark stdlib json vs the app codec (app/utils/json_codec.py) on job data.
+
+Loads and serializes a synthetic job_data.json (job_memory_report's catalogue) and
+times a reactions-sized API payload, with stdlib json and with the codec's
+backend (orjson when installed).
+
+Usage:
+  python scripts/json_benchmark.py
+  python scripts/json_benchmark.py --jobs 100000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from job_memory_report import synthetic_jobs_json  # noqa: E402
+from md_metadata import load_app_module  # noqa: E402
+
+json_codec = load_app_module("utils/json_codec.py")
+
+API_PAYLOAD = {"likes": 128, "dislikes": 3, "status": "liked", "slug": "データサイエンティスト"}
+API_CALLS = 10_000
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    # What Starlette's JSONResponse does.
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50_000, help="synthetic catalogue size")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; best time is reported")
+    args = parser.parse_args()
+
+    raw = synthetic_jobs_json(args.jobs).encode("utf-8")
+    data = json.loads(raw)
+    cases = [
+        ("load job_data.json", lambda: json.loads(raw), lambda: json_codec.loads(raw)),
+        ("dump job_data.json", lambda: stdlib_dumps(data), lambda: json_codec.dumps(data)),
+        (
+            f"API payload x{API_CALLS:,}",
+            lambda: [stdlib_dumps(API_PAYLOAD) for _ in range(API_CALLS)],
+            lambda: [json_codec.dumps(API_PAYLOAD) for _ in range(API_CALLS)],
+        ),
+    ]
+
+    print(f"jobs: {args.jobs:,} ({len(raw) / 1024 / 1024:.1f} MiB)  codec backend: {json_codec.JSON_BACKEND}")
+    print(f"{'case':28}{'json ms':>10}{'codec ms':>10}{'speedup':>9}")
+    for label, stdlib_fn, codec_fn in cases:
+        stdlib_ms = best_ms(stdlib_fn, args.repeat)
+        codec_ms = best_ms(codec_fn, args.repeat)
+        print(f"{label:28}{stdlib_ms:10.1f}{codec_ms:10.1f}{stdlib_ms / max(codec_ms, 1e-9):8.1f}x")
+    if json_codec.orjson is None:
+        print("orjson is not installed: the codec uses stdlib json (pip install orjson).")
+
+
+if __name__ == "__main__":
+    main()
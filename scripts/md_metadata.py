@@ -8,15 +8,28 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-# Load app/md_parser.py directly so build_data does not import app/__init__.py
-# (that pulls dotenv/FastAPI and breaks hub deploy on system Python).
-_MD_PARSER_PATH = Path(__file__).resolve().parents[1] / "app" / "md_parser.py"
-_spec = importlib.util.spec_from_file_location("starful_md_parser_standalone", _MD_PARSER_PATH)
-if _spec is None or _spec.loader is None:
-    raise ImportError(f"cannot load md_parser from {_MD_PARSER_PATH}")
-_md_parser = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_md_parser)
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+
+def load_app_module(filename: str):
+    """Load app/<filename> directly so build scripts do not import app/__init__.py
+    (that pulls dotenv/FastAPI and breaks hub deploy on system Python).
+
+    Only modules without app.* imports (md_parser, seo_helpers, career_render) work here.
+    """
+    path = APP_DIR / filename
+    name = "starful_" + filename.replace("/", "_").removesuffix(".py") + "_standalone"
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {filename} from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_md_parser = load_app_module("md_parser.py")
 parse_starful_md_raw = _md_parser.parse_starful_md_raw
+read_starful_meta_file = _md_parser.read_starful_meta_file
 
 
 def parse_starful_md(raw: str) -> tuple[dict[str, Any], str] | None:
@@ -61,11 +74,13 @@ def ensure_published_at(meta: dict[str, Any], filepath: str) -> tuple[dict[str,
 
 def backfill_published_at_file(filepath: str) -> str | None:
     """Persist published_at from mtime when missing. Returns date or None if not ---json."""
-    parsed = read_starful_md(filepath)
-    if not parsed:
+    if not os.path.isfile(filepath):
+        return None
+    meta = read_starful_meta_file(filepath)
+    if not meta:
         return None
-    meta, body = parsed
     meta, date, changed = ensure_published_at(meta, filepath)
     if changed:
+        _, body = read_starful_md(filepath)
         write_starful_md(filepath, meta, body)
     return date
@@ -9,7 +9,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 sys.path.insert(0, os.path.join(BASE_DIR, "scripts"))
 
-from md_metadata import ensure_published_at, read_starful_md, write_starful_md
+from md_metadata import ensure_published_at, read_starful_md, read_starful_meta_file, write_starful_md
 from slug_utils import normalize_slug
 
 CONTENTS_DIR = os.path.join(BASE_DIR, "app", "contents")
@@ -53,13 +53,13 @@ def main() -> None:
         if not filename.endswith(".md"):
             continue
         filepath = os.path.join(CONTENTS_DIR, filename)
-        parsed = read_starful_md(filepath)
-        if not parsed:
+        meta = read_starful_meta_file(filepath)
+        if not meta:
             continue
-        meta, body = parsed
         slug = normalize_slug(meta.get("slug") or filename[:-3])
         meta, changed = normalize_meta(meta, slug, filepath)
         if changed:
+            _, body = read_starful_md(filepath)
             write_starful_md(filepath, meta, body)
             updated += 1
     print(f"Normalized {updated} markdown file(s) in {CONTENTS_DIR}")
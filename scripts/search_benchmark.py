@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark /search scoring (app/services/search.py) on a synthetic catalogue.
+
+Per-query cost of:
+  scan        search_jobs(): normalizes every job's fields on every query
+  normalized  the same linear scan over SearchIndex's pre-normalized fields
+  index       SearchIndex.search(): inverted-index candidates, pre-normalized fields
+plus the one-off cost of building the SearchIndex (once per job snapshot).
+
+Usage:
+  python scripts/search_benchmark.py
+  python scripts/search_benchmark.py --jobs 100000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from job_memory_report import synthetic_jobs_json  # noqa: E402
+from md_metadata import APP_DIR  # noqa: E402
+
+# search.py imports app modules, so this loads the app package.
+sys.path.insert(0, str(APP_DIR.parent))
+from app.services import search  # noqa: E402
+
+QUERIES = ["データサイエンティスト", "backend", "面接", "ai", "kubernetes", "ＵＩ／ＵＸ"]
+
+
+def best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def scan_normalized(index: search.SearchIndex, query: str) -> list[dict]:
+    terms = search.expand_query_terms(query)
+    scored = []
+    for job, fields in zip(index.jobs, index.fields):
+        score = search.score_search_fields(fields, terms)
+        if score > 0:
+            scored.append((score, job))
+    return search._ranked(scored)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50_000, help="synthetic catalogue size")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query; best time is reported")
+    args = parser.parse_args()
+
+    jobs = json.loads(synthetic_jobs_json(args.jobs))["jobs"]
+    started = time.perf_counter()
+    index = search.SearchIndex(jobs)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    print(f"jobs: {len(jobs):,}  index build: {build_ms:.0f} ms (once per snapshot)")
+    print(f"{'query':26}{'hits':>8}{'scan ms':>10}{'normalized':>12}{'index ms':>10}")
+    for q in QUERIES:
+        expected = search.search_jobs(jobs, q)
+        assert scan_normalized(index, q) == expected == index.search(q), q
+        scan = best_ms(lambda: search.search_jobs(jobs, q), args.repeat)
+        normalized = best_ms(lambda: scan_normalized(index, q), args.repeat)
+        indexed = best_ms(lambda: index.search(q), args.repeat)
+        print(f"{q:26}{len(expected):8,}{scan:10.1f}{normalized:12.1f}{indexed:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
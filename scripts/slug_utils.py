@@ -1,7 +1,10 @@
 """Starful slug / image filename rules (snake_case, no hyphens in assets)."""
 from __future__ import annotations
 
-import re
+from md_metadata import load_app_module
+
+# The app's rule (app/services/job_records.py), so build and hot reload agree.
+normalize_slug = load_app_module("services/job_records.py").normalize_slug
 
 # favicon-32x32, apple-touch-icon 등 표준 웹 아이콘은 하이픈 유지
 PROTECTED_ASSET_PREFIXES = ("favicon", "apple-touch")
@@ -31,14 +34,6 @@ def position_slug(name: str) -> str:
     return normalize_slug(s)
 
 
-def normalize_slug(slug: str) -> str:
-    """Career / image stem: lowercase snake_case only."""
-    s = (slug or "").strip().lower().replace("-", "_")
-    s = re.sub(r"[^a-z0-9_]", "", s)
-    s = re.sub(r"_+", "_", s).strip("_")
-    return s
-
-
 def normalize_image_filename(filename: str) -> str:
     """Normalize asset filename; preserve favicon / apple-touch names."""
     if not filename or "." not in filename:
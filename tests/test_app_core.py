@@ -1,13 +1,48 @@
+import asyncio
 import json
 import os
+import tempfile
+import threading
+import time
 import unittest
+from datetime import date, timedelta
+from unittest import mock
 
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from app import app
-from app.md_parser import parse_starful_md, parse_starful_md_raw
-from app.services.jobs_cache import JOB_DATA, load_jobs_on_startup
-from app.services.search import expand_query_terms, search_jobs
+from app import md_parser
+from app.career_render import render_career_artifact
+from app.config import CAREER_INLINE_SECTIONS
+from app.content_new import enrich_item
+from app.md_parser import parse_starful_md, parse_starful_md_raw, read_starful_meta
+from app.routes import seo as seo_routes
+from app.services import career_pages, content_watch, derived_views, home_view, jobs_cache
+from app.services.compression import page_store
+from app.services.career_pages import CareerPageCache, PrerenderedBundle
+from app.services.page_executor import PageExecutor
+from app.services.job_records import JobRecord
+from app.services.content_watch import ContentScanner
+from app.services.job_snapshot import build_job_snapshot, update_job_snapshot
+from app.services.jobs_cache import JOB_DATA, current_snapshot, load_jobs_on_startup
+from app.services import search as search_mod
+from app.services.search import (
+    SearchIndex,
+    expand_query_terms,
+    normalize_search_text,
+    score_job_for_terms,
+    score_search_fields,
+    search_jobs,
+)
+from app.services.suggest import PrefixTrie, Suggester, snapshot_suggester
+from app.services.text_index import BodyIndex, encode_body_index, markdown_plain_text, text_snippet, tokenize
+from app.services.shared_snapshot import (
+    attach_shared_snapshot,
+    encode_shared_snapshot,
+    shared_snapshot_supported,
+)
+from app.utils import json_codec
 
 DATA_FILE = os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
@@ -138,6 +173,109 @@ class AppCoreTests(unittest.TestCase):
             response.headers.get("location", ""),
         )
 
+    def test_career_detail_conditional_get(self):
+        first = self.client.get("/career/cloud_solutions_architect")
+        etag = first.headers.get("etag")
+        self.assertTrue(etag)
+        self.assertIn("last-modified", first.headers)
+        cached = self.client.get(
+            "/career/cloud_solutions_architect", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached.headers.get("etag"), etag)
+        since = self.client.get(
+            "/career/cloud_solutions_architect",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        )
+        self.assertEqual(since.status_code, 304)
+        changed = self.client.get(
+            "/career/cloud_solutions_architect", headers={"If-None-Match": '"other"'}
+        )
+        self.assertEqual(changed.status_code, 200)
+
+    def test_career_detail_precompressed_variants(self):
+        path = "/career/cloud_solutions_architect"
+        plain = self.client.get(path, headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", plain.headers)
+        self.assertEqual(plain.headers.get("vary"), "Accept-Encoding")
+        gz = self.client.get(path, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(gz.headers.get("content-encoding"), "gzip")
+        self.assertEqual(gz.text, plain.text)
+        self.assertNotEqual(gz.headers["etag"], plain.headers["etag"])
+        revalidated = self.client.get(
+            path, headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers.get("vary"), "Accept-Encoding")
+
+    def test_career_detail_streams_miss_then_serves_stored_variants(self):
+        path = "/career/backend_developer"
+        page_store.clear()
+        with self.client.stream("GET", path, headers={"Accept-Encoding": "gzip"}) as streamed:
+            self.assertEqual(streamed.status_code, 200)
+            self.assertNotIn("content-length", streamed.headers)
+            self.assertNotIn("content-encoding", streamed.headers)
+            body = b"".join(streamed.iter_bytes())
+        stored = self.client.get(path, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(stored.headers.get("content-encoding"), "gzip")
+        self.assertEqual(stored.content, body)
+        page_store.clear()
+        with mock.patch.object(seo_routes, "STREAM_PAGES", False):
+            buffered = self.client.get(path, headers={"Accept-Encoding": "identity"})
+        self.assertEqual(buffered.content, body)
+
+    def test_career_section_fragment(self):
+        response = self.client.get("/career/data_scientist/section/1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers.get("x-robots-tag"), "noindex")
+        self.assertNotIn("<html", response.text)
+        self.assertIn("<h3", response.text)
+        cached = self.client.get(
+            "/career/data_scientist/section/1",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(self.client.get("/career/data_scientist/section/99").status_code, 404)
+
+    def test_career_detail_inlines_whole_guide_by_default(self):
+        self.assertEqual(CAREER_INLINE_SECTIONS, 0)
+        html = self.client.get("/career/data_scientist").text
+        self.assertNotIn('class="career-section-deferred"', html)
+
+    def test_career_section_resolves_like_detail_and_is_not_stored(self):
+        page_store.clear()
+        canonical = self.client.get("/career/ui_ux_designer/section/1")
+        self.assertEqual(canonical.status_code, 200)
+        alias = self.client.get("/career/UX_Designer/section/1")
+        self.assertEqual((alias.status_code, alias.text), (200, canonical.text))
+        self.assertEqual(page_store.stats()["size"], 0)
+        self.assertEqual(alias.headers.get("vary"), "Accept-Encoding")
+
+    def test_home_mbti_sitemap_send_etags(self):
+        for path in ("/", "/mbti/INTJ", "/sitemap.xml"):
+            first = self.client.get(path)
+            etag = first.headers.get("etag")
+            self.assertTrue(etag, path)
+            again = self.client.get(path, headers={"If-None-Match": etag})
+            self.assertEqual(again.status_code, 304, path)
+
+    def test_query_string_pages_are_not_stored(self):
+        page_store.clear()
+        self.client.get("/")
+        size = page_store.stats()["size"]
+        for n in range(3):
+            with self.subTest(n=n):
+                response = self.client.get(
+                    "/", params={"utm_source": f"campaign{n}"}, headers={"Accept-Encoding": "gzip"}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(f"?utm_source=campaign{n}", response.text)
+                self.assertTrue(response.headers.get("etag"))
+                self.assertEqual(response.headers.get("vary"), "Accept-Encoding")
+                self.assertEqual(response.headers.get("content-encoding"), "gzip")
+        self.assertEqual(page_store.stats()["size"], size)
+
     def test_robots_disallows_legacy_paths(self):
         response = self.client.get("/robots.txt")
         self.assertEqual(response.status_code, 200)
@@ -148,6 +286,34 @@ class AppCoreTests(unittest.TestCase):
         self.assertIn("Disallow: /card/", body)
 
 
+class JsonCodecTests(unittest.TestCase):
+    PAYLOAD = {"likes": 1, "title": "データサイエンティスト", "tags": ["AI", None], "ratio": 0.5}
+
+    def test_matches_stdlib_compact_output(self):
+        expected = json.dumps(self.PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode()
+        self.assertEqual(json_codec.dumps(self.PAYLOAD), expected)
+        self.assertEqual(json_codec.loads(expected), self.PAYLOAD)
+        with mock.patch.object(json_codec, "orjson", None):
+            self.assertEqual(json_codec.dumps(self.PAYLOAD), expected)
+            self.assertEqual(json_codec.loads(expected.decode()), self.PAYLOAD)
+
+    def test_load_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8", delete=False) as f:
+            json.dump(self.PAYLOAD, f, ensure_ascii=False)
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual(json_codec.load_file(f.name), self.PAYLOAD)
+
+    def test_api_routers_render_with_codec(self):
+        from app import reactions
+        from app.routes import api_starr
+
+        for router in (reactions.router, api_starr.router):
+            self.assertIs(router.default_response_class, json_codec.FastJSONResponse)
+        response = json_codec.FastJSONResponse(self.PAYLOAD)
+        self.assertEqual(response.body, json_codec.dumps(self.PAYLOAD))
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+
 class MdParserTests(unittest.TestCase):
     def test_json_frontmatter(self):
         raw = '---json\n{"title": "Test", "meta_description": "Desc"}\n---\n# Body'
@@ -177,6 +343,70 @@ class MdParserTests(unittest.TestCase):
         self.assertTrue(meta.get("title"))
         self.assertNotIn("seo_title:", body[:200])
 
+    def test_read_meta_matches_full_parse(self):
+        contents = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "contents"
+        )
+        for filename in sorted(os.listdir(contents)):
+            if filename.endswith(".md"):
+                path = os.path.join(contents, filename)
+                self.assertEqual(read_starful_meta(path), parse_starful_md(path)[0], filename)
+
+    def test_read_meta_grows_window_and_skips_body(self):
+        meta = {"title": "Long", "tags": ["x" * 50] * 40}
+        raw = "\ufeff---json\n" + json.dumps(meta, indent=2) + "\n---\n" + "本文" * 5000
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "long.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(raw)
+            with mock.patch.object(md_parser, "FRONTMATTER_READ_SIZE", 64):
+                self.assertEqual(read_starful_meta(path), meta)
+            plain = os.path.join(tmp, "plain.md")
+            with open(plain, "w", encoding="utf-8") as f:
+                f.write("# No frontmatter\n")
+            self.assertEqual(read_starful_meta(plain), {})
+            self.assertEqual(read_starful_meta(os.path.join(tmp, "missing.md")), {})
+
+
+class CareerRenderTests(unittest.TestCase):
+    def test_pipeline_anchors_toc_lazy_images_and_cache_bust(self):
+        body = (
+            "## 導入 & Overview\n\ntext\n\n![fig](/static/img/a.png)\n\n"
+            "### Q1\n\n## 導入 & Overview\n"
+        )
+        artifact = render_career_artifact({"published_at": "2026-01-02"}, body)
+        html = artifact["content"]
+        self.assertIn('<h2 id="導入-overview">', html)
+        self.assertIn('<h2 id="導入-overview-2">', html)
+        self.assertIn('src="/static/img/a.png?v=2026-01-02"', html)
+        self.assertIn('loading="lazy" decoding="async" />', html)
+        self.assertEqual(
+            artifact["toc"],
+            [
+                {"level": 2, "text": "導入 & Overview", "id": "導入-overview"},
+                {"level": 3, "text": "Q1", "id": "q1"},
+                {"level": 2, "text": "導入 & Overview", "id": "導入-overview-2"},
+            ],
+        )
+        self.assertEqual(artifact["word_count"], (2 + 1) * 2 + 1 + 1)
+
+    def test_sections_split_at_h2_and_defer_after_inline_count(self):
+        body = "# T\n\nintro\n\n## A\n\na\n\n## B\n\nb\n\n### B1\n\n## C\n\nc\n"
+        page = render_career_artifact({}, body)
+        sections = career_pages.career_sections(page)
+        self.assertEqual(len(sections), 3)
+        self.assertEqual("".join(sections), page["content"])
+        self.assertIn("intro", sections[0])
+        self.assertEqual(career_pages.inline_career_content("x", page, 0), page["content"])
+        html = career_pages.inline_career_content("x", page, 1)
+        self.assertIn('<h2 id="b">B</h2>', html)
+        self.assertIn('data-section-src="/career/x/section/2"', html)
+        self.assertNotIn("<p>b</p>", html)
+        fragment = career_pages.career_section_fragment(page, 1)
+        self.assertTrue(fragment.lstrip().startswith("<p>b</p>"))
+        self.assertIn('<h3 id="b1">', fragment)
+        self.assertIsNone(career_pages.career_section_fragment(page, 3))
+
 
 class SearchServiceTests(unittest.TestCase):
     @classmethod
@@ -193,6 +423,241 @@ class SearchServiceTests(unittest.TestCase):
         results = search_jobs(self.jobs, "data")
         self.assertGreater(len(results), 0)
 
+    def test_tokenize_words_and_bigrams(self):
+        self.assertEqual(tokenize("aiエンジニア と c++"), {"ai", "エン", "ンジ", "ジニ", "ニア", "と", "c"})
+
+    def test_index_matches_linear_scan(self):
+        index = SearchIndex(self.jobs)
+        queries = ["data", "backend", "end", "ＡＷＳ", "エンジニア", "ア", "面接対策", "full stack", "c++", "-", ""]
+        queries += [self.jobs[0]["title"], self.jobs[1]["tags"][0] if self.jobs[1]["tags"] else "sql"]
+        for q in queries:
+            with self.subTest(q=q):
+                self.assertEqual(index.search(q), search_jobs(self.jobs, q))
+
+    def test_index_fields_are_normalized_once(self):
+        job = {"title": "ＡＩ  Engineer", "category": "AI-Data", "tags": ["Python", "ＳＱＬ"], "meta_description": "x"}
+        index = SearchIndex([job])
+        self.assertEqual(index.fields[0], ("ai engineer", "ai-data", "python sql", "x"))
+        terms = expand_query_terms("sql")
+        self.assertEqual(score_search_fields(index.fields[0], terms), score_job_for_terms(job, terms))
+        with mock.patch(
+            "app.services.search.normalize_search_text", wraps=search_mod.normalize_search_text
+        ) as normalize:
+            self.assertEqual(index.search("sql"), [job])
+        normalize.assert_called_once_with("sql")  # the query only
+
+    def test_index_only_scores_candidates(self):
+        index = SearchIndex(self.jobs)
+        terms = expand_query_terms("データサイエンティスト")
+        candidates = index.candidates(terms)
+        self.assertLess(len(candidates), len(self.jobs))
+        self.assertEqual(len(index.candidates({"+"})), len(self.jobs))  # nothing to narrow by
+        with mock.patch("app.services.search.score_search_fields", return_value=0) as score:
+            index.search("データサイエンティスト")
+        self.assertEqual(score.call_count, len(candidates))
+
+    def test_updated_index_matches_rebuild(self):
+        index = SearchIndex(self.jobs)
+        jobs = [dict(j) for j in self.jobs[1:]]
+        jobs[0] = {**jobs[0], "title": "Zebrafish Keeper", "tags": ["ＡＷＳ"]}
+        jobs.insert(3, {"id": "new_guide", "title": "Data Backend Engineer", "category": "engineering"})
+        updated = index.updated(jobs, {self.jobs[0]["id"], jobs[0]["id"], "new_guide"})
+        rebuilt = SearchIndex(jobs)
+        self.assertEqual(updated.fields, rebuilt.fields)
+        for q in ["data", "backend", "zebrafish", "aws", "エンジニア", self.jobs[0]["title"], "c++"]:
+            with self.subTest(q=q):
+                terms = expand_query_terms(q)
+                self.assertEqual(updated.candidates(terms), rebuilt.candidates(terms))
+                self.assertEqual(updated.search(q), rebuilt.search(q))
+
+    def test_result_cache_hits_normalized_query(self):
+        snapshot = build_job_snapshot({"jobs": self.jobs})
+        cache = search_mod.SearchResultCache(maxsize=2)
+        no_body = search_mod.BodyIndexFile(os.path.join(tempfile.gettempdir(), "missing_body_index.bin"))
+        with mock.patch.object(search_mod, "search_cache", cache), mock.patch.object(
+            search_mod, "body_index_file", no_body
+        ):
+            first = search_mod.search_snapshot(snapshot, "Data")
+            with mock.patch("app.services.search.score_search_fields") as score:
+                self.assertIs(search_mod.search_snapshot(snapshot, " ｄａｔａ "), first)
+            score.assert_not_called()
+            search_mod.search_snapshot(snapshot, "backend")
+            search_mod.search_snapshot(snapshot, "ai")  # evicts "data"
+        self.assertEqual([j["id"] for j in first], [j["id"] for j in search_jobs(self.jobs, "data")])
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 3, 1))
+        self.assertEqual(stats["hit_ratio"], 0.25)
+
+    def test_result_cache_follows_snapshot_version(self):
+        old = build_job_snapshot({"jobs": self.jobs[:1]})
+        new = build_job_snapshot({"jobs": self.jobs})
+        cache = search_mod.SearchResultCache()
+        no_body = search_mod.BodyIndexFile(os.path.join(tempfile.gettempdir(), "missing_body_index.bin"))
+        with mock.patch.object(search_mod, "search_cache", cache), mock.patch.object(
+            search_mod, "body_index_file", no_body
+        ):
+            search_mod.search_snapshot(old, "data")
+            self.assertEqual(len(search_mod.search_snapshot(new, "data")), len(search_jobs(self.jobs, "data")))
+            search_mod.search_snapshot(old, "ai")  # a request still on the old snapshot
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["invalidations"]), (1, 1))
+
+
+class SuggestTests(unittest.TestCase):
+    JOBS = [
+        {"id": "data_engineer", "title": "データエンジニア", "published": "2025-03-01", "tags": ["SQL", "AWS"]},
+        {"id": "data_scientist", "title": "データサイエンティスト", "published": "2025-02-01", "tags": ["SQL"]},
+        {"id": "cloud_architect", "title": "Cloud Solutions Architect", "published": "2025-01-01", "tags": ["AWS", "SRE"]},
+    ]
+
+    def setUp(self):
+        self.suggester = Suggester(build_job_snapshot({"jobs": self.JOBS}).jobs, {"SQL": [1, 2], "AWS": [1], "SRE": [1]})
+
+    def test_prefixes_are_width_and_case_folded(self):
+        for q in ["データ", "ﾃﾞｰﾀ", "　デー "]:
+            with self.subTest(q=q):
+                careers = self.suggester.suggest(q)["careers"]
+                self.assertEqual([c["id"] for c in careers], ["data_engineer", "data_scientist"])
+        self.assertEqual(self.suggester.suggest("ＡＲＣＨ")["careers"][0]["url"], "/career/cloud_architect")
+        self.assertEqual(self.suggester.suggest("")["careers"], [])
+        self.assertEqual(self.suggester.suggest("zz")["careers"], [])
+
+    def test_tags_by_use_and_synonym_groups(self):
+        result = self.suggester.suggest("s")
+        self.assertEqual([t["tag"] for t in result["tags"]], ["SQL", "SRE"])
+        self.assertEqual(result["tags"][0]["count"], 2)
+        self.assertIn("devops", [g["key"] for g in self.suggester.suggest("ｓｒｅ")["synonyms"]])
+        self.assertEqual(self.suggester.suggest("バックエ")["synonyms"][0]["url"], "/search?q=backend")
+        self.assertEqual(len(self.suggester.suggest("デ", k=1)["careers"]), 1)
+
+    def test_trie_lists_an_item_once_per_prefix(self):
+        trie = PrefixTrie([(["aa", "a"], "x"), (["ab"], "y")], limit=2)
+        self.assertEqual(trie.lookup("a"), ["x", "y"])
+        self.assertEqual(trie.lookup("ab"), ["y"])
+
+    def test_suggest_endpoint_headers(self):
+        load_jobs_on_startup()
+        client = TestClient(app, base_url="https://starful.biz")
+        response = client.get("/api/suggest", params={"q": "ﾃﾞｰﾀ", "limit": 3})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["query"], "データ")
+        self.assertTrue(0 < len(data["careers"]) <= 3)
+        self.assertTrue(all(normalize_search_text(c["title"]).startswith("データ") for c in data["careers"]))
+        self.assertIn("public, max-age=", response.headers["cache-control"])
+        cached = client.get(
+            "/api/suggest", params={"q": "ﾃﾞｰﾀ", "limit": 3}, headers={"If-None-Match": response.headers["etag"]}
+        )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.headers["cache-control"], response.headers["cache-control"])
+        self.assertEqual(client.get("/api/suggest", params={"limit": 100}).status_code, 422)
+
+    def test_suggester_is_built_when_a_snapshot_is_published(self):
+        self.addCleanup(load_jobs_on_startup)
+        load_jobs_on_startup()
+        client = TestClient(app, base_url="https://starful.biz")
+        builds = snapshot_suggester.builds
+        self.assertEqual(client.get("/api/suggest", params={"q": "data"}).status_code, 200)
+        self.assertEqual(snapshot_suggester.builds, builds)  # requests never build
+
+        job = dict(current_snapshot().jobs[0])
+        jobs_cache.apply_job_updates([{**job, "title": "Zebrafish Keeper"}], [], time.time())
+        self.assertEqual(snapshot_suggester.builds, builds + 1)
+        self.assertIs(snapshot_suggester.latest().version, current_snapshot().version)
+        careers = client.get("/api/suggest", params={"q": "zebra"}).json()["careers"]
+        self.assertEqual([c["id"] for c in careers], [job["id"]])
+
+
+class BodyIndexTests(unittest.TestCase):
+    DOCS = [
+        ("devops_engineer", "## Kubernetes\n\nKubernetes と Terraform の運用経験を問われます。"),
+        ("data_analyst", "SQL と A/Bテスト の設計。**Kubernetes** は不要です。"),
+        ("designer", "ポートフォリオ の見せ方。[作品集](https://example.com) と ![x](/static/img/x.png)"),
+    ]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "body_index.bin")
+        docs = [(doc_id, markdown_plain_text(body)) for doc_id, body in self.DOCS]
+        with open(self.path, "wb") as f:
+            f.write(encode_body_index(docs))
+        self.index = BodyIndex(self.path)
+
+    def test_plain_text_drops_markup(self):
+        self.assertEqual(markdown_plain_text(self.DOCS[2][1]), "ポートフォリオ の見せ方。作品集 と")
+        self.assertEqual(markdown_plain_text("## Ｋ８ｓ\n\n- **a**"), "K8s a")
+
+    def test_bm25_scores(self):
+        scores = self.index.scores("kubernetes")
+        self.assertEqual(set(scores), {"devops_engineer", "data_analyst"})
+        self.assertGreater(scores["devops_engineer"], scores["data_analyst"])
+        self.assertTrue(all(0 < v <= 1 for v in scores.values()))
+        self.assertEqual(set(self.index.scores("Ａ／Ｂテスト")), {"data_analyst"})
+        self.assertEqual(self.index.scores("zzz"), {})
+        self.assertEqual(self.index.scores(""), {})
+
+    def test_snippet(self):
+        before, match, after = self.index.snippet("data_analyst", "a/bテスト", width=10)
+        self.assertEqual(match, "A/Bテスト")
+        self.assertTrue(before.startswith("…") or before.startswith("SQL"))
+        self.assertIsNone(self.index.snippet("designer", "kubernetes"))
+        self.assertIsNone(self.index.snippet("missing", "sql"))
+
+    def test_snippet_matches_latin_words_only(self):
+        text = "Airflow と TPMの話。AI 基盤の TPM を担う。"
+        self.assertEqual(text_snippet(text, "ai", width=4), ("…話。", "AI", " 基…"))
+        self.assertIsNone(text_snippet("Airflow と TPM", "pm"))
+        self.assertEqual(text_snippet(text, "tpm", width=0)[1], "TPM")
+        self.assertEqual(text_snippet(text, "の話", width=0)[1], "の話")
+
+    def test_reloaded_file_releases_the_old_mapping(self):
+        body_file = search_mod.BodyIndexFile(self.path)
+        old = body_file.get()
+        mapping = old._mm
+        body_file.patch({"designer": "Figma"})
+        del old
+        with open(self.path, "wb") as f:
+            f.write(encode_body_index([("designer", "Sketch")]))
+        os.utime(self.path, (1_700_000_000, 1_700_000_000))
+        self.assertEqual(body_file.get().text("designer"), "Sketch")
+        self.assertTrue(mapping.closed)
+
+    def test_search_blends_body_relevance(self):
+        jobs = [
+            {"id": "devops_engineer", "title": "DevOps Engineer", "category": "engineering"},
+            {"id": "data_analyst", "title": "Data Analyst", "category": "ai-data"},
+            {"id": "designer", "title": "Designer", "category": "design"},
+        ]
+        index = SearchIndex(jobs)
+        self.assertEqual(index.search("kubernetes"), [])
+        self.assertEqual([j["id"] for j in index.search("kubernetes", self.index)], ["devops_engineer", "data_analyst"])
+        with mock.patch.object(search_mod, "BODY_MIN_RELEVANCE", 1.0):
+            self.assertEqual(index.search("kubernetes", self.index), [])
+        self.assertEqual(index.search("designer", self.index), [jobs[2]])
+
+    def test_search_page_shows_snippets(self):
+        load_jobs_on_startup()
+        client = TestClient(app, base_url="https://starful.biz")
+        with mock.patch.object(search_mod, "body_index_file", search_mod.BodyIndexFile(self.path)):
+            html = client.get("/search", params={"q": "Terraform"}).text
+        self.assertIn('href="/career/devops_engineer"', html)
+        self.assertIn('<p class="card-snippet">', html)
+        self.assertIn("<mark>Terraform</mark>", html)
+
+    def test_snippets_come_from_the_body_the_results_were_ranked_with(self):
+        body = search_mod.BodyIndexFile(self.path)
+        with mock.patch.object(search_mod, "body_index_file", body), mock.patch.object(
+            search_mod, "search_cache", search_mod.SearchResultCache()
+        ):
+            current = search_mod.current_body_index()
+            snapshot = build_job_snapshot({"jobs": [{"id": "devops_engineer"}]})
+            results = search_mod.search_snapshot(snapshot, "terraform", current)
+            os.remove(self.path)  # a rebuild in between must not change the snippets
+            snippets = search_mod.body_snippets([j["id"] for j in results], "terraform", current[0])
+        self.assertEqual([j["id"] for j in results], ["devops_engineer"])
+        self.assertEqual(snippets["devops_engineer"][1], "Terraform")
+
 
 class JobsCacheTests(unittest.TestCase):
     def test_load_populates_shared_dict(self):
@@ -200,7 +665,627 @@ class JobsCacheTests(unittest.TestCase):
 
         load_jobs_on_startup()
         self.assertGreater(len(JOB_DATA.get("jobs", [])), 0)
-        self.assertIs(pages_mod.JOB_DATA, JOB_DATA)
+        self.assertIs(pages_mod.current_snapshot, current_snapshot)
+        self.assertEqual(len(current_snapshot().jobs), len(JOB_DATA["jobs"]))
+
+    def test_reload_builds_new_snapshot(self):
+        load_jobs_on_startup()
+        first = current_snapshot()
+        load_jobs_on_startup()
+        second = current_snapshot()
+        self.assertIsNot(first, second)
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(first.jobs, second.jobs)
+        self.assertIs(jobs_cache.previous_snapshot(), first)
+
+    def test_job_data_is_read_only_view_of_snapshot(self):
+        load_jobs_on_startup()
+        self.assertIs(JOB_DATA["jobs"], current_snapshot().jobs)
+        self.assertEqual(JOB_DATA["total_count"], current_snapshot().total_count)
+        self.assertIn("last_updated", dict(JOB_DATA))
+        with self.assertRaises(TypeError):
+            JOB_DATA["jobs"] = []
+
+    def test_readers_never_see_partial_reload(self):
+        load_jobs_on_startup()
+        data = {**current_snapshot().data, "jobs": list(current_snapshot().jobs)}
+        expected = len(data["jobs"])
+        stop = threading.Event()
+        seen: set[int] = set()
+
+        def reader():
+            while not stop.is_set():
+                seen.add(len(JOB_DATA.get("jobs", [])))
+                seen.add(len(current_snapshot().by_id))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for _ in range(200):
+            jobs_cache._publish(build_job_snapshot(data))
+        stop.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(seen, {expected})
+
+
+class JobsCacheRefreshTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "job_data.json")
+        self._write(["a"], mtime=1_000_000)
+        self.addCleanup(load_jobs_on_startup)  # runs last: back to the real job_data.json
+        patcher = mock.patch.object(jobs_cache, "DATA_FILE", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(jobs_cache.stop_jobs_watcher)
+        load_jobs_on_startup()
+
+    def _write(self, ids, mtime):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"total_count": len(ids), "jobs": [{"id": i} for i in ids]}, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_checks_are_throttled(self):
+        self._write(["a", "b"], mtime=2_000_000)
+        with mock.patch.object(jobs_cache, "JOBS_CHECK_INTERVAL", 3600), mock.patch.object(
+            jobs_cache, "_LAST_CHECK", time.monotonic()
+        ), mock.patch.object(jobs_cache.os, "stat", wraps=os.stat) as stat:
+            for _ in range(50):
+                jobs_cache.ensure_jobs_cache()
+            self.assertEqual(stat.call_count, 0)
+            self.assertEqual(len(current_snapshot().jobs), 1)
+        with mock.patch.object(jobs_cache, "JOBS_CHECK_INTERVAL", 0):
+            jobs_cache.ensure_jobs_cache()
+        self.assertEqual(len(current_snapshot().jobs), 2)
+
+    def test_watcher_reloads_in_background(self):
+        jobs_cache.start_jobs_watcher(interval=0.05)
+        with mock.patch.object(jobs_cache, "reload_jobs_if_changed") as reload:
+            jobs_cache.ensure_jobs_cache()
+            reload.assert_not_called()
+        before = current_snapshot().version
+        self._write(["a", "b", "c"], mtime=3_000_000)
+        deadline = time.monotonic() + 5
+        while current_snapshot().version == before and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(len(current_snapshot().jobs), 3)
+
+
+class JobSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = build_job_snapshot(
+            {
+                "total_count": 4,
+                "last_updated": "2026-01-01",
+                "jobs": [
+                    {"id": "a", "category": "Engineering", "published": "2025-01-01", "tags": ["AWS", "AWS"]},
+                    {"id": "data_scientist", "category": "engineering", "published": "2025-03-01", "tags": ["AWS"]},
+                    {"id": "c", "category": "design", "published": "2025-02-01"},
+                    {"id": "b", "category": "engineering", "published": "2025-01-01"},
+                ],
+            }
+        )
+
+    def test_indexes(self):
+        snap = self.snapshot
+        self.assertEqual(snap.get("c")["category"], "design")
+        self.assertIsNone(snap.get("missing"))
+        self.assertEqual([j["id"] for j in snap.in_category("ENGINEERING")], ["data_scientist", "b", "a"])
+        self.assertEqual(snap.in_category("nope"), ())
+        self.assertEqual([j["id"] for j in snap.tagged("AWS")], ["a", "data_scientist"])
+        self.assertEqual([j["id"] for j in snap.featured], ["data_scientist"])
+        self.assertEqual([j["id"] for j in snap.lookup(["c", "zz", "a"])], ["c", "a"])
+        self.assertEqual(snap.resolve("UX_Designer"), "ui_ux_designer")
+        self.assertEqual(snap.resolve("c"), "c")
+        self.assertEqual((snap.total_count, snap.last_updated), (4, "2026-01-01"))
+
+    def test_img_urls(self):
+        from app.services import media
+
+        urls = self.snapshot.img_urls
+        self.assertTrue(urls["c"].endswith("/c.png?v=2025-02-01"))
+        self.assertTrue(urls["unknown"].endswith("/unknown.png"))
+        self.assertNotIn("unknown", urls)
+        self.assertEqual(len(urls), 4)
+        with mock.patch.object(media, "ensure_jobs_cache"), mock.patch.object(
+            jobs_cache, "_SNAPSHOT", self.snapshot
+        ):
+            self.assertEqual(media.career_img_url("c"), urls["c"])
+        self.assertIs(home_view.home_view_model(self.snapshot)["img_urls"], urls)
+
+    def test_update_matches_full_rebuild(self):
+        jobs = [dict(j) for j in self.snapshot.jobs]
+        upserts = [
+            {"id": "c", "category": "engineering", "published": "2025-04-01", "tags": ["GCP"]},
+            {"id": "new", "category": "design", "published": "2024-12-01", "tags": ["AWS"]},
+        ]
+        updated = update_job_snapshot(self.snapshot, upserts, removed=["a"], mtime=5.0)
+        expected = build_job_snapshot(
+            {"total_count": 4, "last_updated": "2026-01-01",
+             "jobs": [upserts[0], jobs[1], jobs[3], upserts[1]]}
+        )
+        ids = lambda items: [j["id"] for j in items]  # noqa: E731
+        self.assertEqual(ids(updated.jobs), ["c", "data_scientist", "b", "new"])
+        self.assertEqual(
+            {k: ids(v) for k, v in updated.by_category.items()},
+            {k: ids(v) for k, v in expected.by_category.items()},
+        )
+        self.assertEqual(
+            {k: ids(v) for k, v in updated.by_tag.items()},
+            {k: ids(v) for k, v in expected.by_tag.items()},
+        )
+        self.assertEqual(dict(updated.img_urls), dict(expected.img_urls))
+        self.assertEqual((updated.total_count, updated.mtime, updated.data_mtime), (4, 5.0, 0.0))
+        self.assertGreater(updated.version, self.snapshot.version)
+        self.assertIs(updated.get("data_scientist"), self.snapshot.get("data_scientist"))
+        self.assertIs(update_job_snapshot(self.snapshot), self.snapshot)
+        self.assertEqual(updated.changed, (self.snapshot.version, frozenset({"a", "c", "new"})))
+        same = [dict(self.snapshot.get("b"))]
+        self.assertIs(update_job_snapshot(self.snapshot, same, removed=["missing"], mtime=6.0), self.snapshot)
+
+    def test_frozen(self):
+        with self.assertRaises(Exception):
+            self.snapshot.jobs = ()
+        with self.assertRaises(TypeError):
+            self.snapshot.by_id["x"] = {}
+
+
+class ContentWatchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app, base_url="https://starful.biz")
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.addCleanup(load_jobs_on_startup)
+        load_jobs_on_startup()
+        body_path = os.path.join(self.dir, "body_index.bin")
+        with open(body_path, "wb") as f:
+            f.write(encode_body_index([("placeholder", "Unrelated guide text")]))
+        body_file = search_mod.BodyIndexFile(body_path)
+        self.cache = search_mod.SearchResultCache()
+        for target, name, value in (
+            (search_mod, "body_index_file", body_file),
+            (content_watch, "body_index_file", body_file),
+            (search_mod, "search_cache", self.cache),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._write("hot_reload_demo", "Before")
+        self.scanner = ContentScanner(self.dir)
+        self.assertEqual(self.scanner.check(), [])  # baseline
+
+    def _write(self, name, title, mtime=1_700_000_000, body="## Body\n", **extra):
+        path = os.path.join(self.dir, f"{name}.md")
+        meta = {"title": title, "category": "engineering", "tags": ["Hot"], "published_at": "2026-02-01", **extra}
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"---json\n{json.dumps(meta)}\n---\n{body}")
+        os.utime(path, (mtime, mtime))
+
+    def test_only_changed_files_are_parsed(self):
+        total = current_snapshot().total_count
+        self._write("hot_reload_demo", "After", mtime=1_700_000_100)
+        self._write("hot_reload_new", "New guide")
+        with mock.patch.object(career_pages.career_page_cache, "discard") as discard:
+            affected = self.scanner.check()
+        self.assertEqual(sorted(affected), ["hot_reload_demo", "hot_reload_new"])
+        self.assertEqual(self.scanner.files_parsed, 2)
+        self.assertEqual(sorted(c.args[0] for c in discard.call_args_list), sorted(affected))
+        snap = current_snapshot()
+        self.assertEqual(snap.get("hot_reload_demo")["title"], "After")
+        self.assertEqual(snap.get("hot_reload_new")["link"], "/career/hot_reload_new")
+        self.assertEqual(snap.total_count, total + 2)
+        self.assertEqual([j["id"] for j in snap.tagged("Hot")], ["hot_reload_new", "hot_reload_demo"])
+        self.assertIn("/career/hot_reload_new<", self.client.get("/sitemap.xml").text)
+
+        self.assertEqual(self.scanner.check(), [])
+        os.remove(os.path.join(self.dir, "hot_reload_new.md"))
+        self.assertEqual(self.scanner.check(), ["hot_reload_new"])
+        self.assertIsNone(current_snapshot().get("hot_reload_new"))
+        self.assertNotIn("/career/hot_reload_new<", self.client.get("/sitemap.xml").text)
+
+    def test_snapshot_mtime_comes_from_the_files(self):
+        edited_at = current_snapshot().mtime + 1
+        self._write("hot_reload_demo", "After", mtime=edited_at)
+        self.scanner.check()
+        self.assertEqual(current_snapshot().mtime, edited_at)
+        # Restored with an older mtime: the file's ctime still moves it forward.
+        self._write("hot_reload_demo", "Before", mtime=1_700_000_000)
+        self.scanner.check()
+        self.assertEqual(current_snapshot().get("hot_reload_demo")["title"], "Before")
+        restored = os.stat(os.path.join(self.dir, "hot_reload_demo.md"))
+        self.assertEqual(current_snapshot().mtime, max(restored.st_ctime, edited_at))
+
+    def test_job_data_reload_replaces_hot_reloaded_jobs(self):
+        self._write("hot_reload_new", "New guide")
+        self.scanner.check()
+        self.assertIsNotNone(current_snapshot().get("hot_reload_new"))
+        data_mtime = current_snapshot().data_mtime
+        with mock.patch.object(jobs_cache.os, "stat", return_value=mock.Mock(st_mtime=data_mtime + 1)):
+            jobs_cache.reload_jobs_if_changed()
+        self.assertIsNone(current_snapshot().get("hot_reload_new"))
+
+    def test_body_edit_patches_search_without_new_snapshot(self):
+        self._write("hot_reload_demo", "Before", mtime=1_700_000_100, body="Zebrafish husbandry\n")
+        self.scanner.check()
+        snap = current_snapshot()
+        self.assertEqual([j["id"] for j in search_mod.search_snapshot(snap, "zebrafish")], ["hot_reload_demo"])
+        unrelated = search_mod.search_snapshot(snap, "sql")
+
+        self._write("hot_reload_demo", "Before", mtime=1_700_000_200, body="Axolotl husbandry\n")
+        self.assertEqual(self.scanner.check(), ["hot_reload_demo"])
+        self.assertIs(current_snapshot(), snap)  # frontmatter unchanged
+        self.assertEqual(search_mod.search_snapshot(snap, "zebrafish"), ())
+        self.assertEqual([j["id"] for j in search_mod.search_snapshot(snap, "axolotl")], ["hot_reload_demo"])
+        hits = self.cache.hits
+        self.assertIs(search_mod.search_snapshot(snap, "sql"), unrelated)
+        self.assertEqual(self.cache.hits, hits + 1)
+        self.assertEqual((self.cache.dropped, self.cache.invalidations), (1, 0))
+
+    def test_frontmatter_slug_names_the_job(self):
+        self._write("hot-reload-file", "Slugged", slug="Hot-Reload-Slug")
+        self.assertEqual(self.scanner.check(), ["hot_reload_slug"])
+        self.assertEqual(current_snapshot().get("hot_reload_slug")["title"], "Slugged")
+        os.remove(os.path.join(self.dir, "hot-reload-file.md"))
+        self.assertEqual(self.scanner.check(), ["hot_reload_slug"])
+        self.assertIsNone(current_snapshot().get("hot_reload_slug"))
+
+    def test_career_etag_ignores_other_guides_content(self):
+        snap = current_snapshot()
+        featured = {j["id"] for j in snap.featured}
+        career_id = snap.jobs[0]["id"]
+        other = next(j for j in snap.jobs if j["id"] not in featured and j["id"] != career_id)
+        def career_etag():
+            url = f"/career/{career_id}"
+            return self.client.get(url, headers={"Accept-Encoding": "identity"}).headers["etag"]
+
+        etag = career_etag()
+        jobs_cache.apply_job_updates([{**dict(other), "meta_description": "Edited"}], [], time.time())
+        self.assertEqual(career_etag(), etag)
+        jobs_cache.apply_job_updates([{**dict(other), "title": "Renamed"}], [], time.time())
+        self.assertNotEqual(career_etag(), etag)
+
+
+class JobRecordTests(unittest.TestCase):
+    RAW = {
+        "id": "data_scientist",
+        "title": "Data Scientist",
+        "category": "ai-data",
+        "tags": ["Python", "SQL"],
+        "published": "2025-03-01",
+        "extra_field": 1,
+    }
+
+    def test_reads_like_the_source_dict(self):
+        job = JobRecord(self.RAW)
+        self.assertEqual(job["title"], "Data Scientist")
+        self.assertEqual(job.title, "Data Scientist")
+        self.assertEqual(job.get("tags"), ("Python", "SQL"))
+        self.assertEqual(job.get("link", "fallback"), "fallback")
+        self.assertEqual(job["extra_field"], 1)
+        self.assertNotIn("link", job)
+        with self.assertRaises(KeyError):
+            job["link"]
+        self.assertEqual(dict(job), {**self.RAW, "tags": ("Python", "SQL")})
+        with self.assertRaises(AttributeError):
+            job.title = "x"
+
+    def test_repeated_strings_are_interned(self):
+        a = JobRecord(json.loads(json.dumps(self.RAW)))
+        b = JobRecord(json.loads(json.dumps(self.RAW)))
+        self.assertIs(a.category, b.category)
+        self.assertIs(a.tags[0], b.tags[0])
+
+    def test_enrich_returns_badged_view(self):
+        job = JobRecord({**self.RAW, "published": "2025-03-01T09:00:00"})
+        view = enrich_item(job, cutoff="2025-01-01")
+        self.assertEqual((view["published"], view.is_new, view.title), ("2025-03-01", True, "Data Scientist"))
+        self.assertEqual(dict(view), {**dict(job), "published": "2025-03-01", "is_new": True})
+        self.assertEqual(job.published, "2025-03-01T09:00:00")
+        undated = enrich_item(JobRecord({"id": "x"}), cutoff="2025-01-01")
+        self.assertEqual(dict(undated), {"id": "x", "is_new": False})
+        self.assertEqual(dict(undated), enrich_item({"id": "x"}, cutoff="2025-01-01"))
+        with self.assertRaises(AttributeError):
+            view.is_new = False
+
+
+@unittest.skipUnless(shared_snapshot_supported(), "needs fcntl")
+class SharedSnapshotTests(unittest.TestCase):
+    DATA = {
+        "total_count": 2,
+        "last_updated": "2025-03-01",
+        "jobs": [
+            {**JobRecordTests.RAW, "link": "/career/data_scientist"},
+            {"id": "cto", "title": "CTO", "category": "ai-data", "tags": [], "nested": {"a": [1]}},
+        ],
+    }
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_file = os.path.join(tmp.name, "job_data.json")
+        self.shared = os.path.join(tmp.name, "jobs.snap")
+        self._write(self.DATA, 1000.0)
+
+    def _write(self, data, mtime):
+        with open(self.data_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.utime(self.data_file, (mtime, mtime))
+
+    def test_records_match_job_records(self):
+        store = attach_shared_snapshot(self.data_file, self.shared, 1000.0)
+        self.assertEqual((store.generation, store.source_mtime), (1, 1000.0))
+        self.assertEqual(store.meta, {"total_count": 2, "last_updated": "2025-03-01"})
+        for shared, raw in zip(store.records(), self.DATA["jobs"]):
+            self.assertIsInstance(shared, JobRecord)
+            self.assertEqual(dict(shared), dict(JobRecord(raw)))
+        data_scientist, cto = store.records()
+        self.assertEqual((data_scientist.title, data_scientist.get("tags")), ("Data Scientist", ("Python", "SQL")))
+        self.assertNotIn("link", cto)
+        self.assertEqual(cto.get("link", "none"), "none")
+        self.assertEqual(cto["nested"], {"a": [1]})
+        with self.assertRaises(AttributeError):
+            cto.title = "x"
+
+    def test_rewrites_only_for_a_new_source_mtime(self):
+        attach_shared_snapshot(self.data_file, self.shared, 1000.0)
+        inode = os.stat(self.shared).st_ino
+        self.assertEqual(attach_shared_snapshot(self.data_file, self.shared, 1000.0).generation, 1)
+        self.assertEqual(os.stat(self.shared).st_ino, inode)
+
+        self._write({**self.DATA, "jobs": self.DATA["jobs"][:1]}, 2000.0)
+        store = attach_shared_snapshot(self.data_file, self.shared, 2000.0)
+        self.assertEqual((store.generation, store.job_count), (2, 1))
+
+    def test_snapshot_over_shared_records(self):
+        store = attach_shared_snapshot(self.data_file, self.shared, 1000.0)
+        snapshot = build_job_snapshot({**store.meta, "jobs": store.records()}, store.source_mtime, store.generation)
+        self.assertEqual(snapshot.generation, 1)
+        self.assertIs(snapshot.get("cto"), snapshot.jobs[1])
+        self.assertEqual([j["id"] for j in snapshot.in_category("AI-Data")], ["data_scientist", "cto"])
+        view = enrich_item(snapshot.get("data_scientist"), cutoff="2025-01-01")
+        self.assertEqual((view["published"], view.is_new, view.title), ("2025-03-01", True, "Data Scientist"))
+
+    def test_jobs_cache_loads_through_shared_file(self):
+        self.addCleanup(load_jobs_on_startup)
+        with mock.patch.multiple(jobs_cache, DATA_FILE=self.data_file, SHARED_SNAPSHOT_FILE=self.shared):
+            load_jobs_on_startup()
+            snapshot = current_snapshot()
+        self.assertEqual((snapshot.generation, snapshot.total_count), (1, 2))
+        self.assertTrue(os.path.exists(self.shared))
+
+    def test_jobs_cache_reloads_on_a_new_generation(self):
+        self.addCleanup(load_jobs_on_startup)
+        with mock.patch.multiple(jobs_cache, DATA_FILE=self.data_file, SHARED_SNAPSHOT_FILE=self.shared):
+            load_jobs_on_startup()
+            jobs_cache.reload_jobs_if_changed()
+            self.assertEqual(current_snapshot().generation, 1)
+            # Another worker rewrote the file; job_data.json's mtime is unchanged.
+            data = {**self.DATA, "total_count": 1, "jobs": self.DATA["jobs"][:1]}
+            with open(self.shared, "wb") as f:
+                f.write(encode_shared_snapshot(data, 1000.0, 2))
+            jobs_cache.reload_jobs_if_changed()
+            snapshot = current_snapshot()
+        self.assertEqual((snapshot.generation, snapshot.total_count), (2, 1))
+        self.assertIsNone(snapshot.get("cto"))
+
+
+class HomeViewTests(unittest.TestCase):
+    def setUp(self):
+        today = date.today().isoformat()
+        self.snapshot = build_job_snapshot(
+            {
+                "jobs": [
+                    {"id": "old", "category": "design", "published": "2000-01-01"},
+                    {"id": "new", "category": "design", "published": today},
+                    {"id": "data_scientist", "category": "ai-data", "published": "2001-01-01"},
+                ]
+            }
+        )
+
+    def test_built_once_per_snapshot_and_day(self):
+        with mock.patch.object(
+            home_view, "new_content_cutoff", wraps=home_view.new_content_cutoff
+        ) as cutoff:
+            view = home_view.home_view_model(self.snapshot)
+            self.assertIs(home_view.home_view_model(self.snapshot), view)
+            self.assertEqual(cutoff.call_count, 1)
+            with mock.patch.object(derived_views, "date") as fake_date:
+                fake_date.today.return_value = date.today() + timedelta(days=1)
+                self.assertIsNot(home_view.home_view_model(self.snapshot), view)
+            self.assertEqual(cutoff.call_count, 2)
+        design = next(c for c in view["grouped_items"] if c["slug"] == "design")
+        self.assertEqual([(j["id"], j["is_new"]) for j in design["job_items"]], [("new", True), ("old", False)])
+        self.assertEqual([j["id"] for j in view["featured_jobs"]], ["data_scientist"])
+        self.assertNotIn("is_new", self.snapshot.get("new"))
+
+    def test_new_snapshot_rebuilds(self):
+        view = home_view.home_view_model(self.snapshot)
+        other = build_job_snapshot({"jobs": list(self.snapshot.jobs)})
+        self.assertIsNot(home_view.home_view_model(other), view)
+
+
+class DerivedViewTests(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = build_job_snapshot({"jobs": [{"id": "b", "title": "B"}, {"id": "a", "title": "A"}]})
+        self.builds = []
+        self.view = derived_views.DerivedView("test_titles", self._build)
+        self.addCleanup(derived_views._REGISTRY.pop, "test_titles")
+
+    def _build(self, snapshot):
+        self.builds.append(snapshot.version)
+        return tuple(sorted(j["title"] for j in snapshot.jobs))
+
+    def test_built_once_per_snapshot_version(self):
+        value = self.view.get(self.snapshot)
+        self.assertIs(self.view.get(self.snapshot), value)
+        other = build_job_snapshot({"jobs": [{"id": "c", "title": "C"}]})
+        self.assertEqual(self.view.get(other), ("C",))
+        self.assertEqual(self.builds, [self.snapshot.version, other.version])
+
+    def test_updater_patches_the_parent_snapshot_value(self):
+        self.view.updater(lambda value, snapshot: value + tuple(sorted(snapshot.changed[1])))
+        self.view.get(self.snapshot)
+        updated = update_job_snapshot(self.snapshot, [{"id": "c", "title": "C"}])
+        self.assertEqual(self.view.get(updated), ("A", "B", "c"))
+        self.assertEqual((self.view.builds, self.view.updates), (1, 1))
+        other = build_job_snapshot({"jobs": [{"id": "d", "title": "D"}]})
+        self.assertEqual(self.view.get(other), ("D",))
+        self.assertEqual((self.view.builds, self.view.updates), (2, 1))
+
+    def test_stats_list_registered_views(self):
+        self.view.get(self.snapshot)
+        self.view.get(self.snapshot)
+        stats = {row["name"]: row for row in derived_views.derived_view_stats()}
+        self.assertTrue({"home", "practice_options", "sitemap_xml"} <= set(stats))
+        row = stats["test_titles"]
+        self.assertEqual((row["size"], row["builds"], row["hits"]), (2, 1, 1))
+        self.assertEqual(row["key"], (self.snapshot.version,))
+        self.assertGreaterEqual(row["last_build_ms"], 0)
+
+    def test_practice_and_sitemap_reuse_the_snapshot_build(self):
+        from app.routes import pages as pages_mod
+
+        client = TestClient(app, base_url="https://starful.biz")
+        load_jobs_on_startup()
+        page_store.clear()
+        for path in ("/practice", "/sitemap.xml"):
+            self.assertEqual(client.get(path).status_code, 200)
+        builds = (pages_mod._practice_options.builds, seo_routes._sitemap_xml.builds)
+        page_store.clear()
+        for path in ("/practice", "/sitemap.xml"):
+            self.assertEqual(client.get(path).status_code, 200)
+        self.assertEqual((pages_mod._practice_options.builds, seo_routes._sitemap_xml.builds), builds)
+
+
+class CareerPageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(career_pages, "CONTENTS_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bundle_path = os.path.join(self.tmp.name, "career_pages.json")
+
+    def _write(self, career_id, heading, mtime):
+        path = os.path.join(self.tmp.name, f"{career_id}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                '---json\n{"title": "T", "published_at": "2026-01-02"}\n---\n'
+                f"## {heading}\n\n![x](/static/img/x.png)\n"
+            )
+        os.utime(path, (mtime, mtime))
+
+    def test_hit_after_first_render(self):
+        self._write("demo", "One", 1_700_000_000)
+        cache = CareerPageCache(maxsize=4, bundle=PrerenderedBundle(self.bundle_path))
+        first = cache.get("demo")
+        self.assertIn("/static/img/x.png?v=2026-01-02", first["content"])
+        self.assertIs(cache.get("demo"), first)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_mtime_change_rerenders(self):
+        self._write("demo", "One", 1_700_000_000)
+        cache = CareerPageCache(maxsize=4, bundle=PrerenderedBundle(self.bundle_path))
+        self.assertIn("One", cache.get("demo")["content"])
+        self._write("demo", "Two", 1_700_000_100)
+        self.assertIn("Two", cache.get("demo")["content"])
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_discard_drops_one_career(self):
+        self._write("a", "A", 1_700_000_000)
+        self._write("b", "B", 1_700_000_000)
+        cache = CareerPageCache(maxsize=4, bundle=PrerenderedBundle(self.bundle_path))
+        cache.get("a")
+        cache.get("b")
+        cache.discard("a")
+        self.assertEqual(cache.stats()["size"], 1)
+        cache.get("b")
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_missing_file_and_eviction(self):
+        cache = CareerPageCache(maxsize=1, bundle=PrerenderedBundle(self.bundle_path))
+        self.assertIsNone(cache.get("nope"))
+        self._write("a", "A", 1_700_000_000)
+        self._write("b", "B", 1_700_000_000)
+        cache.get("a")
+        cache.get("b")
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["evictions"], 1)
+
+    def _write_bundle(self, source):
+        bundle = {
+            "version": career_pages.RENDER_VERSION,
+            "careers": {
+                "demo": {
+                    "meta": {"title": "Bundled"},
+                    "content": "<p>prerendered</p>",
+                    "toc": [],
+                    "word_count": 1,
+                    "faq_items": [],
+                    "source": source,
+                }
+            },
+        }
+        with open(self.bundle_path, "w", encoding="utf-8") as f:
+            json.dump(bundle, f)
+
+    def test_prerendered_bundle_used_when_fresh(self):
+        self._write("demo", "Live", 1_700_000_000)
+        st = os.stat(os.path.join(self.tmp.name, "demo.md"))
+        self._write_bundle({"mtime": int(st.st_mtime), "size": st.st_size})
+        cache = CareerPageCache(maxsize=4, bundle=PrerenderedBundle(self.bundle_path))
+        self.assertEqual(cache.get("demo")["content"], "<p>prerendered</p>")
+        self.assertEqual(cache.meta("demo")["title"], "Bundled")
+        self.assertEqual(cache.stats()["prerendered"], 1)
+
+    def test_stale_bundle_falls_back_to_live_render(self):
+        self._write("demo", "Live", 1_700_000_000)
+        self._write_bundle({"mtime": 1, "size": 1})
+        cache = CareerPageCache(maxsize=4, bundle=PrerenderedBundle(self.bundle_path))
+        self.assertIn("Live", cache.get("demo")["content"])
+        self.assertEqual(cache.stats()["rendered"], 1)
+
+
+class PageExecutorTests(unittest.TestCase):
+    def test_runs_off_loop_and_counts(self):
+        executor = PageExecutor(max_workers=2, queue_limit=0)
+        self.addCleanup(executor.shutdown)
+
+        async def main():
+            return await asyncio.gather(*(executor.run(pow, i, 2) for i in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [0, 1, 4, 9, 16])
+        stats = executor.stats()
+        self.assertEqual(stats["completed"], 5)
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(stats["running"], 0)
+        self.assertGreaterEqual(stats["max_queue_depth"], 1)
+
+    def test_queue_limit_rejects(self):
+        executor = PageExecutor(max_workers=1, queue_limit=1)
+        self.addCleanup(executor.shutdown)
+
+        async def main():
+            busy = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+            await asyncio.sleep(0.05)
+            waiting = asyncio.ensure_future(executor.run(pow, 2, 2))
+            await asyncio.sleep(0)
+            with self.assertRaises(HTTPException) as ctx:
+                await executor.run(pow, 3, 2)
+            self.assertEqual(ctx.exception.status_code, 503)
+            await busy
+            self.assertEqual(await waiting, 4)
+
+        asyncio.run(main())
+        self.assertEqual(executor.stats()["rejected"], 1)
 
 
 if __name__ == "__main__":